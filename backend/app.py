@@ -1,5 +1,4 @@
-from flask import Flask, request, jsonify, send_from_directory
-import pandas as pd
+from flask import Flask, Response, request, jsonify, redirect, send_file
 import re
 import os
 from flask_cors import CORS
@@ -7,14 +6,11 @@ from dotenv import load_dotenv
 import json
 import uuid
 from datetime import datetime
-from letter_generation import (
-    ViolationDataCollector,
-    PDFGenerator,
-)
-from pdf_generator.board_report import generate_board_report
+from letter_generation import InspectionWindow
 
 # from letter_generation import generate_pdfs
 from database import db, init_db
+from database.districts import district_lookup_codes
 from database.models import (
     ViolationReport,
     Violation,
@@ -23,33 +19,31 @@ from database.models import (
     Account,
     AccountHistory,
     ContactPreference,
-    import_excel_to_db,
 )
 
 # sqlalchemy import
 from sqlalchemy import or_
 
-# cloudinary import
-import cloudinary
-import cloudinary.uploader
-from cloudinary.utils import cloudinary_url
+from utils.account_cache import AccountPayloadCache
+from utils.account_search import AccountSearchRegistry
+from utils.job_queue import JobQueue
+from utils.roster_version import current_roster_version
+from utils.storage import get_storage
 
 # from utils.violation_codes import get_violation_titles_for_district
 
 # Load environment variables from .env file
+# (Cloudinary is configured by utils.storage when STORAGE_BACKEND=cloudinary)
 load_dotenv()
 
-# Configuration
-cloudinary.config(
-    cloud_name=os.getenv("CLOUD_NAME"),
-    api_key=os.getenv("API_KEY"),
-    api_secret=os.getenv("API_SECRET"),
-    secure=True,
-)
 
+def create_app(migrations=False):
+    """
+    Application factory pattern
 
-def create_app():
-    """Application factory pattern"""
+    Args:
+        migrations: Register Flask-Migrate (manage_db.py); the API doesn't need it
+    """
     app = Flask(__name__)
 
     # Configuration
@@ -78,7 +72,7 @@ def create_app():
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
     # Initialize database
-    init_db(app)
+    init_db(app, migrations=migrations)
 
     # Enable CORS
     CORS(app)
@@ -89,9 +83,11 @@ def create_app():
 # Create app instance
 app = create_app()
 
-# load dataset into db
+# load dataset into db (or import every roster with: python manage_db.py import-all)
 # with app.app_context():
 #     try:
+#         from database.models import import_excel_to_db
+#
 #         import_excel_to_db(
 #             excel_path="../datasets/SRMD_CL_250516.xlsx",
 #             district_code="SRMD",
@@ -121,6 +117,87 @@ def generate_unique_filename(original_filename: str) -> str:
     return unique_name
 
 
+def format_account_payload(account) -> dict:
+    """Format an account for the autocomplete API"""
+    # Parse city, state, zip from service_city_st_zip
+    city, state, zip_code = parse_city_state_zip(account.service_city_st_zip)
+
+    return {
+        "id": account.id,
+        "account_number": account.account_number,
+        "account_name": account.account_name,
+        "service_address": account.service_address,
+        "city": city,
+        "state": state,
+        "zip": zip_code,
+        "lot_number": account.lot_number,
+    }
+
+
+def load_search_payloads(district_id: int) -> list:
+    """Load all searchable account payloads for a district"""
+    accounts = Account.query.filter(
+        Account.district_id == district_id,
+        Account.service_address.isnot(None),
+        Account.service_address != "",
+    ).all()
+    return [format_account_payload(account) for account in accounts]
+
+
+def format_searchable_account(account):
+    """Format an account for the search index, or None if it has no service address"""
+    return format_account_payload(account) if account.service_address else None
+
+
+# Per-district prefix search indexes for the autocomplete `q=` mode
+account_search = AccountSearchRegistry(
+    loader=load_search_payloads,
+    formatter=format_searchable_account,
+    version_source=current_roster_version,
+)
+account_search.listen(Account)
+
+
+# Serialized, gzip-precompressed full account listings per district
+account_payload_cache = AccountPayloadCache()
+
+
+def resolve_district_ids(district_code: str) -> list:
+    """Find the database ids of the district(s) matching a frontend district code"""
+    # Get the possible district codes/names for this district
+    possible_codes = district_lookup_codes(district_code)
+
+    # Find the district(s) in the database
+    districts = District.query.filter(
+        or_(
+            District.code.in_(possible_codes),
+            District.name.in_(possible_codes),
+            District.label.in_(possible_codes),
+        )
+    ).all()
+
+    return [d.id for d in districts]
+
+
+def cached_payload_response(entry):
+    """Serve a cached payload, honoring If-None-Match and gzip Accept-Encoding"""
+    # Each encoding has its own strong ETag; only match the one we would send
+    use_gzip = bool(request.accept_encodings["gzip"])
+    etag = entry.gzip_etag if use_gzip else entry.etag
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    elif use_gzip:
+        response = Response(entry.gzip_body, mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(entry.body, mimetype="application/json")
+
+    response.set_etag(etag)
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
 @app.route("/api/district/<string:district_code>/accounts", methods=["GET"])
 def get_district_accounts(district_code: str):
     """
@@ -131,7 +208,9 @@ def get_district_accounts(district_code: str):
         district_code: The district code (e.g., 'ventana', 'winsome', 'mountain_sky')
 
     Query Parameters:
-        limit: Maximum number of accounts to return (default: no limit)
+        q: Optional search text; returns the top ranked accounts whose service
+           address or name has a word starting with it (e.g. "3027 lake" or "helen")
+        limit: Maximum number of accounts to return (default: no limit, 20 with q)
         active_only: If true, only return accounts with service addresses (default: true)
 
     Returns:
@@ -141,36 +220,24 @@ def get_district_accounts(district_code: str):
         # Get query parameters
         limit = request.args.get("limit", type=int)
         active_only = request.args.get("active_only", default="true").lower() == "true"
+        query_text = request.args.get("q")
 
-        # Map frontend district codes to database district codes/names
-        # You may need to adjust this mapping based on your actual data
-        district_code_mapping = {
-            "ventana": ["VENTANA", "VMD"],
-            "winsome": ["WINSOME", "WMD"],
-            "waters_edge": ["WATERS_EDGE", "WEMD"],
-            "highlands_mead": ["HIGHLANDS_MEAD", "HMMD"],
-            "muegge_farms": ["MUEGGE_FARMS", "MFMD"],
-            "mountain_sky": ["MOUNTAIN_SKY", "MSMD"],
-            "littleton_village": ["LITTLETON_VILLAGE", "LVMD"],
-            "red_barn": ["RED_BARN", "RBMD"],
-            "saddler_ridge": ["SADDLER_RIDGE", "SRMD"],
-        }
-
-        # Get the possible district codes/names for this district
-        possible_codes = district_code_mapping.get(
-            district_code.lower(), [district_code.upper()]
-        )
+        # Payloads carry the normalized code so every caller gets the same bytes
+        district_key = district_code.lower()
 
-        # Find the district(s) in the database
-        districts = District.query.filter(
-            or_(
-                District.code.in_(possible_codes),
-                District.name.in_(possible_codes),
-                District.label.in_(possible_codes),
-            )
-        ).all()
+        # Full listings are precomputed per district and only change on import
+        cache_key = (district_key, active_only)
+        cacheable = query_text is None and not limit
+        cached = account_payload_cache.get(cache_key)
+        if cacheable and cached is not None:
+            return cached_payload_response(cached)
+
+        if cached is not None:
+            district_ids = cached.district_ids
+        else:
+            district_ids = resolve_district_ids(district_code)
 
-        if not districts:
+        if not district_ids:
             return (
                 jsonify(
                     {
@@ -181,8 +248,10 @@ def get_district_accounts(district_code: str):
                 404,
             )
 
-        # Get district IDs
-        district_ids = [d.id for d in districts]
+        # Search mode: answer from the in-memory index instead of listing everything
+        if query_text is not None:
+            matches = account_search.search(district_ids, query_text, limit or 20)
+            return jsonify([dict(match, district=district_key) for match in matches])
 
         # Build the query for accounts
         query = Account.query.filter(Account.district_id.in_(district_ids))
@@ -200,27 +269,20 @@ def get_district_accounts(district_code: str):
         accounts = query.all()
 
         # Format the response for autocomplete
-        formatted_accounts = []
-        for account in accounts:
-            # Parse city, state, zip from service_city_st_zip
-            city, state, zip_code = parse_city_state_zip(account.service_city_st_zip)
-
-            account_data = {
-                "id": account.id,
-                "account_number": account.account_number,
-                "account_name": account.account_name,
-                "service_address": account.service_address,
-                "city": city,
-                "state": state,
-                "zip": zip_code,
-                "district": district_code,  # Use the requested district code
-                "lot_number": account.lot_number,
-            }
-            formatted_accounts.append(account_data)
+        formatted_accounts = [
+            dict(format_account_payload(account), district=district_key)
+            for account in accounts
+        ]
 
         # Sort by service address for better UX
         formatted_accounts.sort(key=lambda x: x["service_address"] or "")
 
+        if cacheable:
+            entry = account_payload_cache.put(
+                cache_key, formatted_accounts, district_ids
+            )
+            return cached_payload_response(entry)
+
         return jsonify(formatted_accounts)
 
     except Exception as e:
@@ -361,33 +423,25 @@ def create_violation_report():
                 file = request.files[image_key]
                 if file and file.filename and allowed_file(file.filename):
                     try:
-                        # Upload to Cloudinary
-                        upload_result = cloudinary.uploader.upload(
-                            file,
-                            folder="violations",
-                            use_filename=True,
-                            unique_filename=True,
+                        # Upload to the configured storage (Cloudinary or local disk)
+                        stored = get_storage().put(
+                            file, file.filename, folder="violations"
                         )
 
-                        # Extract necessary metadata
-                        public_id = upload_result["public_id"]
-                        secure_url = upload_result["secure_url"]
-                        original_filename = file.filename
-
                         # Save to your DB
                         violation_image = ViolationImage(
                             violation_id=violation.id,
-                            filename=public_id,  # or upload_result["original_filename"]
-                            original_filename=original_filename,
-                            file_path=secure_url,  # this now holds the Cloudinary URL
-                            file_size=upload_result.get("bytes", 0),
-                            mime_type=upload_result.get("resource_type", "image"),
+                            filename=stored.key,  # Cloudinary public_id or local key
+                            original_filename=file.filename,
+                            file_path=stored.url,
+                            file_size=stored.size,
+                            mime_type=stored.mime_type,
                             # uploaded_at=backdate, # removing because we do not need to backdate
                         )
                         db.session.add(violation_image)
 
                     except Exception as upload_err:
-                        print(f"Cloudinary upload failed: {upload_err}")
+                        print(f"Image upload failed: {upload_err}")
 
         # Commit all changes
         db.session.commit()
@@ -409,14 +463,82 @@ def create_violation_report():
         return jsonify({"error": "Failed to create violation report"}), 500
 
 
-@app.route("/api/images/<filename>")
-def serve_image(filename: str):
-    """Serve uploaded images"""
+@app.route("/api/images/<path:key>")
+def serve_image(key: str):
+    """Serve an uploaded image by its storage key"""
+    storage = get_storage()
     try:
-        return send_from_directory(app.config["UPLOAD_FOLDER"], filename)
-    except Exception as e:
+        path = storage.local_path(key)
+    except ValueError:
         return jsonify({"error": "Image not found"}), 404
 
+    if path:
+        # send_file hands the open file to the WSGI server (sendfile where supported)
+        return send_file(path, conditional=True, max_age=86400)
+    if storage.name == "local":
+        return jsonify({"error": "Image not found"}), 404
+    # Remote storage serves the image itself
+    return redirect(storage.url(key))
+
+
+# Letter runs and board reports are queued here and run by worker.py
+job_queue = JobQueue()
+
+
+def enqueue_district_job(district_code: str, kind: str):
+    """Validate a district job request and queue it for the worker"""
+    district_ids = resolve_district_ids(district_code)
+    if not district_ids:
+        return jsonify({"error": f"District not found: {district_code}"}), 404
+    district = db.session.get(District, district_ids[0])
+
+    params = request.get_json(silent=True) or {}
+    try:
+        # Fail fast on bad dates instead of inside the worker
+        InspectionWindow.from_params(params, district.name)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid inspection window: {e}"}), 400
+
+    job = job_queue.enqueue(
+        kind,
+        dict(
+            params,
+            district_name=district.name,
+            district_label=district.label,
+            district_code=district.code,
+        ),
+    )
+    return jsonify(job), 202, {"Location": f"/api/jobs/{job['id']}"}
+
+
+@app.route("/api/districts/<string:district_code>/letters", methods=["POST"])
+def queue_letters(district_code: str):
+    """
+    Queue a letter run for a district.
+
+    JSON body (all optional): start_date/end_date, dates, since or
+    since_last_mailing to pick the inspection window (default: today);
+    workers; record_mailing; merged (one mail-merge PDF with a page index)
+    and letters_per_file (split merged output). Poll GET /api/jobs/<id> for
+    progress.
+    """
+    return enqueue_district_job(district_code, "letters")
+
+
+@app.route("/api/districts/<string:district_code>/board-report", methods=["POST"])
+def queue_board_report(district_code: str):
+    """Queue a board report for a district (same window options as letters)"""
+    return enqueue_district_job(district_code, "board_report")
+
+
+@app.route("/api/jobs/<int:job_id>", methods=["GET"])
+def get_job(job_id: int):
+    """Report a job's status, progress, throughput and output paths"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Job not found: {job_id}"}), 404
+    return jsonify(job)
+
 
 @app.route("/api/health", methods=["GET"])
 def health_check():
@@ -444,21 +566,4 @@ def internal_error(e):
 if __name__ == "__main__":
     debug_mode = os.environ.get("FLASK_DEBUG", "0") == "1"
 
-    # run join on district and address
-    with app.app_context():
-        # New object-oriented approach (recommended)
-        collector = ViolationDataCollector("winsome")
-        consolidated_data = collector.collect_violation_data()
-        violations = [v for group in consolidated_data for v in group]
-        print(
-            f"Collected {len(consolidated_data)} violation records for PDF generation."
-        )
-        PDFGenerator.generate_consolidated_pdfs(consolidated_data)
-    # board report
-    # generate_board_report(
-    #     output_path="board_report.pdf",
-    #     district_name="Highlands Mead",
-    #     violations=violations,
-    #     date=datetime.now().strftime("%B %d, %Y"),
-    # )
     app.run(debug=debug_mode, host="0.0.0.0", port=int(os.environ.get("PORT", 8000)))
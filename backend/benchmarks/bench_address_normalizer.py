@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Compare the legacy regex/replace AddressNormalizer with the token-level one.
+
+Normalizes the service and mailing addresses of every roster in datasets/
+(repeated to simulate a year of letter runs) and checks that both
+implementations agree apart from the intended trail/trl/tr fix.
+
+Usage: python benchmarks/bench_address_normalizer.py [datasets_dir] [rounds]
+"""
+
+import glob
+import os
+import re
+import sys
+import time
+
+import seed  # noqa: F401  (puts the backend packages on sys.path)
+
+import pandas as pd
+
+from utils.address_normalizer import AddressNormalizer, _normalize_cached
+
+LEGACY_SUFFIX_MAP = {
+    " street": " st",
+    " avenue": " ave",
+    " boulevard": " blvd",
+    " drive": " dr",
+    " road": " rd",
+    " lane": " ln",
+    " court": " ct",
+    " place": " pl",
+    " trail": " tr",  # the duplicate key left only this entry
+    " parkway": " pkwy",
+    " circle": " cir",
+    " terrace": " ter",
+    " way": " wy",
+}
+
+
+def legacy_normalize(addr):
+    """The original AddressNormalizer.normalize, kept for comparison."""
+    if not addr:
+        return ""
+    addr = addr.strip().lower()
+    addr = re.sub(r"[.,]", "", addr)
+    addr = re.sub(r"\s+", " ", addr)
+    addr = addr.rstrip()
+    for long_form, short_form in LEGACY_SUFFIX_MAP.items():
+        if addr.endswith(long_form):
+            addr = addr[: -len(long_form)] + short_form
+        addr = addr.replace(long_form + " ", short_form + " ")
+    return addr.strip()
+
+
+def trail_as_trl(normalized):
+    tokens = normalized.split()
+    return (
+        " ".join(
+            [tokens[0]] + ["trl" if token == "tr" else token for token in tokens[1:]]
+        )
+        if tokens
+        else ""
+    )
+
+
+def load_addresses(directory):
+    addresses = []
+    for path in sorted(glob.glob(os.path.join(directory, "*_CL_*.xlsx"))):
+        if os.path.basename(path).startswith("~$"):
+            continue
+        df = pd.read_excel(path, usecols=["ServiceAddress", "MailAddress"])
+        for column in ("ServiceAddress", "MailAddress"):
+            addresses.extend(value for value in df[column] if isinstance(value, str))
+    return addresses
+
+
+def timed(label, func, baseline=None):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    speedup = f"  ({baseline / elapsed:5.1f}x)" if baseline else ""
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms{speedup}")
+    return elapsed
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else "../datasets"
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    addresses = load_addresses(directory)
+    workload = addresses * rounds
+    print(f"{len(addresses)} roster addresses x {rounds} rounds = {len(workload)}")
+
+    # The only intended difference: "trail" and "tr" now both become "trl"
+    mismatches = [
+        addr
+        for addr in addresses
+        if trail_as_trl(legacy_normalize(addr)) != AddressNormalizer.normalize(addr)
+    ]
+    print(f"Unexpected differences vs legacy: {len(mismatches)}")
+    for addr in mismatches[:10]:
+        print(
+            f"  {addr!r}: {legacy_normalize(addr)!r} != {AddressNormalizer.normalize(addr)!r}"
+        )
+
+    legacy = timed("legacy", lambda: [legacy_normalize(a) for a in workload])
+    timed(
+        "token pass (no memo)",
+        lambda: [AddressNormalizer._normalize_uncached(a) for a in workload],
+        legacy,
+    )
+    _normalize_cached.cache_clear()
+    timed(
+        "memoized normalize",
+        lambda: [AddressNormalizer.normalize(a) for a in workload],
+        legacy,
+    )
+    _normalize_cached.cache_clear()
+    series = pd.Series(workload)
+    timed(
+        "normalize_many (Series)",
+        lambda: AddressNormalizer.normalize_many(series),
+        legacy,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Compare query counts and timings of lazy vs eager violation data collection.
+
+Usage: python benchmarks/bench_collection.py [reports]
+"""
+
+import contextlib
+import io
+import sys
+import time
+
+from seed import INSPECTION_DATE, make_app, seed_district
+
+from database import db
+from database.instrumentation import count_queries
+from letter_generation import InspectionWindow, ViolationDataCollector
+
+
+def run(eager):
+    window = InspectionWindow.on_dates([INSPECTION_DATE.date()])
+    collector = ViolationDataCollector("winsome", eager=eager, window=window)
+    start = time.perf_counter()
+    # Silence the per-report progress output while timing
+    with count_queries() as counter, contextlib.redirect_stdout(io.StringIO()):
+        consolidated = list(collector.iter_violation_groups())
+    elapsed = time.perf_counter() - start
+    return counter.count, elapsed, sum(len(group) for group in consolidated)
+
+
+def main():
+    reports = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        seed_district(accounts=2000, reports=reports)
+
+        for label, eager in (("lazy", False), ("eager", True)):
+            db.session.expire_all()
+            queries, elapsed, violations = run(eager)
+            print(
+                f"{label:>5}: {queries:5d} queries, {elapsed * 1000:8.1f} ms, "
+                f"{violations} violations collected"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Measure fuzzy address matching latency and accuracy against a district-sized
+account set.
+
+Accounts are the roster service addresses from datasets/ topped up with
+synthetic addresses; queries are roster addresses with one random typo in the
+street name.
+
+Usage: python benchmarks/bench_fuzzy_match.py [accounts] [queries]
+"""
+
+import glob
+import os
+import random
+import sys
+import time
+
+from seed import STREETS
+
+import pandas as pd
+
+from utils.address_normalizer import AddressNormalizer
+from utils.fuzzy_address import FuzzyAddressMatcher
+
+
+def roster_addresses(directory="../datasets"):
+    addresses = set()
+    for path in glob.glob(os.path.join(directory, "*_CL_*.xlsx")):
+        if os.path.basename(path).startswith("~$"):
+            continue
+        df = pd.read_excel(path, usecols=["ServiceAddress"])
+        addresses.update(AddressNormalizer.normalize_many(df["ServiceAddress"]))
+    addresses.discard("")
+    return sorted(addresses)
+
+
+def with_typo(address, rng):
+    house, rest = address.split(" ", 1)
+    position = rng.randrange(len(rest))
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    edit = rng.choice(("replace", "drop", "insert"))
+    if edit == "replace":
+        rest = rest[:position] + letter + rest[position + 1 :]
+    elif edit == "drop":
+        rest = rest[:position] + rest[position + 1 :]
+    else:
+        rest = rest[:position] + letter + rest[position:]
+    return f"{house} {rest}"
+
+
+def main():
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    rng = random.Random(7)
+
+    real = roster_addresses()
+    addresses = list(real)
+    i = 0
+    while len(addresses) < accounts:
+        addresses.append(
+            AddressNormalizer.normalize(
+                f"{100 + i % 900} {STREETS[i // 900 % len(STREETS)]}"
+            )
+        )
+        i += 1
+    addresses = addresses[:accounts]
+
+    start = time.perf_counter()
+    matcher = FuzzyAddressMatcher((address, address) for address in addresses)
+    build = time.perf_counter() - start
+
+    samples = [rng.choice(real) for _ in range(queries)]
+    typos = [with_typo(address, rng) for address in samples]
+
+    start = time.perf_counter()
+    results = [matcher.match(typo) for typo in typos]
+    elapsed = time.perf_counter() - start
+
+    correct = sum(
+        1
+        for result, expected in zip(results, samples)
+        if result and result.item == expected
+    )
+    wrong = sum(
+        1
+        for result, expected in zip(results, samples)
+        if result and result.item != expected
+    )
+    print(f"{len(matcher)} accounts indexed in {build * 1000:.1f} ms")
+    print(
+        f"{queries} typo queries: {elapsed / queries * 1e6:.1f} us/report, "
+        f"{correct} correct, {wrong} wrong, {queries - correct - wrong} sent to review "
+        f"(threshold {matcher.threshold})"
+    )
+
+
+if __name__ == "__main__":
+    main()
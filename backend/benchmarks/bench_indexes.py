@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Show query plans and latencies for the hot lookup queries with and without
+the secondary indexes, on a synthetic dataset (100k accounts by default).
+
+Uses a temporary SQLite file unless BENCH_DATABASE_URL points at Postgres.
+
+Usage: python benchmarks/bench_indexes.py [accounts]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+from seed import INSPECTION_DATE, make_app, seed_district
+
+from sqlalchemy import text
+
+from database import db
+
+DISTRICTS = 10
+REPEAT = 20
+
+QUERIES = {
+    "autocomplete": (
+        "SELECT id, account_number, account_name, service_address, service_city_st_zip "
+        "FROM accounts WHERE district_id = :district_id "
+        "AND service_address IS NOT NULL AND service_address <> '' "
+        "ORDER BY service_address"
+    ),
+    "letter accounts": "SELECT * FROM accounts WHERE district_id = :district_id",
+    "inspection window": (
+        "SELECT * FROM violation_reports WHERE district = :district "
+        "AND created_at >= :start AND created_at < :end"
+    ),
+    "violations by report": "SELECT * FROM violations WHERE report_id = :report_id",
+    "images by violation": (
+        "SELECT * FROM violation_images WHERE violation_id = :violation_id"
+    ),
+}
+
+
+def secondary_indexes():
+    return [index for table in db.metadata.sorted_tables for index in table.indexes]
+
+
+def explain(sql, params):
+    if db.engine.dialect.name == "postgresql":
+        rows = db.session.execute(text(f"EXPLAIN ANALYZE {sql}"), params).fetchall()
+        return [row[0] for row in rows]
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def measure(label, params):
+    print(f"\n=== {label} ===")
+    for name, sql in QUERIES.items():
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            db.session.execute(text(sql), params).fetchall()
+        elapsed_ms = (time.perf_counter() - start) * 1000 / REPEAT
+        print(f"{name:<22} {elapsed_ms:8.2f} ms")
+        for line in explain(sql, params):
+            print(f"    {line}")
+
+
+def main():
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    database_uri = os.environ.get("BENCH_DATABASE_URL")
+    tmp_dir = None
+    if not database_uri:
+        tmp_dir = tempfile.TemporaryDirectory()
+        database_uri = f"sqlite:///{os.path.join(tmp_dir.name, 'bench.db')}"
+
+    app = make_app(database_uri)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        per_district = accounts // DISTRICTS
+        for i in range(DISTRICTS):
+            seed_district(
+                district_name=f"district_{i}",
+                district_code=f"D{i}MD",
+                district_label=f"District {i}",
+                accounts=per_district,
+                reports=per_district // 20,
+                seed=i,
+            )
+
+        params = {
+            "district_id": DISTRICTS // 2,
+            "district": f"district_{DISTRICTS // 2}",
+            "start": INSPECTION_DATE.replace(hour=0),
+            "end": INSPECTION_DATE.replace(hour=0) + timedelta(days=1),
+            "report_id": 42,
+            "violation_id": 42,
+        }
+
+        with db.engine.begin() as conn:
+            for index in secondary_indexes():
+                index.drop(conn)
+        db.session.execute(text("ANALYZE"))
+        measure("without secondary indexes", params)
+
+        with db.engine.begin() as conn:
+            for index in secondary_indexes():
+                index.create(conn)
+        db.session.execute(text("ANALYZE"))
+        measure("with secondary indexes", params)
+
+        db.session.remove()
+        db.drop_all()
+
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Measure per-letter render time of consolidated violation letters with cold vs
+warm letter templates.
+
+"cold" clears the stylesheet, district flowable and regulation caches before
+every letter, which is what every letter used to pay; "warm" reuses them.
+Letters carry real regulation texts from utils/violation_codes.py and no
+images, so the timing is layout only.
+
+Usage: python benchmarks/bench_letter_render.py [letters]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+# Make the backend packages importable when run as `python benchmarks/<script>.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_generator import letter_template
+from pdf_generator.generate_pdf import ViolationNoticePDF
+from utils.violation_codes import violations
+
+DISTRICT = "winsome"
+
+
+def make_groups(count):
+    """Address groups of two violations each, cycling the district's codes."""
+    codes = list(violations[DISTRICT].items())
+    groups = []
+    for i in range(count):
+        group = []
+        for j in range(2):
+            violation_type, regulation = codes[(i + j) % len(codes)]
+            group.append(
+                {
+                    "district_name": DISTRICT,
+                    "district_label": "Winsome",
+                    "homeowner_name": f"Homeowner {i}",
+                    "homeowner_email": None,
+                    "mailing_address": f"{1000 + i} Winsome Cir",
+                    "mailing_city_st_zip": "Mead, CO 80542",
+                    "property_address": f"{1000 + i} Winsome Cir",
+                    "violation_id": i * 2 + j,
+                    "violation_type": violation_type,
+                    "violation_images": [],
+                    "regulation": regulation,
+                    "report_updated_at": "2025-07-31",
+                }
+            )
+        groups.append(group)
+    return groups
+
+
+def run(groups, output_dir, cold):
+    timings = []
+    # Silence the per-letter homeowner output while timing
+    with contextlib.redirect_stdout(io.StringIO()):
+        for group in groups:
+            start = time.perf_counter()
+            if cold:
+                letter_template.get_stylesheet.cache_clear()
+                letter_template.district_flowables.cache_clear()
+                letter_template.regulation_flowable.cache_clear()
+            ViolationNoticePDF(output_dir=output_dir).generate_consolidated_pdf(group)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    letters = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    groups = make_groups(letters)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        run(groups[:5], output_dir, cold=False)  # warm up imports and fonts
+        for label, cold in (("cold", True), ("warm", False)):
+            timings = sorted(run(groups, output_dir, cold))
+            total = sum(timings)
+            print(
+                f"{label}: {total / letters * 1000:.2f} ms/letter "
+                f"(p50 {timings[len(timings) // 2] * 1000:.2f} ms, "
+                f"p95 {timings[int(len(timings) * 0.95)] * 1000:.2f} ms)"
+            )
+
+
+if __name__ == "__main__":
+    main()
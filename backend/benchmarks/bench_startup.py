@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Measure cold start of the API worker and manage_db.py.
+
+Each run starts a fresh interpreter, so nothing is shared between runs.
+Reports the median wall-clock time, the slowest imports by cumulative time
+(from one extra `python -X importtime` run), and whether any of the batch-only modules (pandas,
+ReportLab, PIL, Alembic) were loaded by the API. Exits with status 1 when
+the API misses its cold start target or loads a batch-only module, so the
+check can run in CI.
+
+Usage: python benchmarks/bench_startup.py [runs] [--save importtime.txt]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold start target for `import app` (create_app included), in milliseconds.
+# Flask and SQLAlchemy alone take about 500 ms on a single-core dev box.
+STARTUP_TARGET_MS = float(os.environ.get("STARTUP_TARGET_MS", 1000))
+
+# Modules only the batch tooling (imports, letters, migrations) should load
+BATCH_ONLY_MODULES = ("pandas", "numpy", "reportlab", "PIL", "alembic", "openpyxl")
+
+COMMANDS = {
+    "api": ["-c", "import app"],
+    "manage_db": ["manage_db.py"],
+}
+
+
+def run(args, importtime=False):
+    """Run python with args in a fresh interpreter; return (seconds, stderr)."""
+    env = dict(os.environ, DATABASE_URL=os.environ.get("DATABASE_URL", "sqlite://"))
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + args
+    start = time.perf_counter()
+    result = subprocess.run(
+        command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return time.perf_counter() - start, result.stderr
+
+
+def parse_importtime(log):
+    """Return {module: cumulative microseconds} from -X importtime output."""
+    modules = {}
+    for line in log.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def main():
+    args = sys.argv[1:]
+    save_path = None
+    if "--save" in args:
+        index = args.index("--save")
+        save_path = args[index + 1]
+        del args[index : index + 2]
+    runs = int(args[0]) if args else 5
+
+    ok = True
+    for label, args in COMMANDS.items():
+        run(args)  # warm the bytecode and OS file caches
+        timings = [run(args)[0] for _ in range(runs)]
+        median_ms = statistics.median(timings) * 1000
+        _, log = run(args, importtime=True)
+        modules = parse_importtime(log)
+
+        print(f"{label}: {median_ms:.0f} ms median over {runs} runs")
+        top_level = {
+            name: cumulative
+            for name, cumulative in modules.items()
+            if "." not in name and name not in ("encodings", "site")
+        }
+        for name, cumulative in sorted(
+            top_level.items(), key=lambda item: item[1], reverse=True
+        )[:8]:
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+        if label == "api":
+            loaded = [name for name in BATCH_ONLY_MODULES if name in modules]
+            if loaded:
+                ok = False
+                print(f"❌ API loads batch-only modules: {', '.join(loaded)}")
+            if median_ms > STARTUP_TARGET_MS:
+                ok = False
+                print(f"❌ API cold start over target ({STARTUP_TARGET_MS:.0f} ms)")
+            else:
+                print(f"✅ API cold start within target ({STARTUP_TARGET_MS:.0f} ms)")
+            if save_path:
+                with open(save_path, "w") as f:
+                    f.write(log)
+                print(f"  importtime log saved to {save_path}")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Helpers for seeding a throwaway database with a synthetic district for benchmarks
+"""
+
+import os
+import random
+import sys
+from datetime import datetime
+
+# Make the backend packages importable when run as `python benchmarks/<script>.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from database import db, init_db
+from database.models import (
+    Account,
+    District,
+    Violation,
+    ViolationImage,
+    ViolationReport,
+)
+from utils.address_normalizer import AddressNormalizer
+
+STREETS = [
+    "Lake Helen Blvd",
+    "Deer Creek Dr",
+    "Mountain Sky Way",
+    "Red Barn Trail",
+    "Saddler Ridge Rd",
+    "Muegge Farms Ave",
+    "Ventana Ct",
+    "Winsome Cir",
+]
+VIOLATION_TYPES = ["weeds", "grass", "trash", "debris", "rv"]
+INSPECTION_DATE = datetime(2025, 7, 31, 10, 0, 0)
+
+
+def make_app(database_uri=None):
+    """Create a minimal app bound to a benchmark database (in-memory SQLite by default)"""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_uri or os.environ.get(
+        "BENCH_DATABASE_URL", "sqlite:///:memory:"
+    )
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    init_db(app)
+    return app
+
+
+def seed_district(
+    district_name="winsome",
+    district_code="WMD",
+    district_label="Winsome",
+    accounts=500,
+    reports=100,
+    violations_per_report=2,
+    seed=42,
+):
+    """
+    Create a district with synthetic accounts and violation reports.
+
+    Must be called inside an app context. Report addresses are drawn from the
+    account service addresses so they match during letter collection.
+    """
+    rng = random.Random(seed)
+
+    district = District(name=district_name, label=district_label, code=district_code)
+    db.session.add(district)
+    db.session.flush()
+
+    addresses = []
+    account_rows = []
+    for i in range(accounts):
+        address = f"{1000 + i} {STREETS[i % len(STREETS)]}"
+        addresses.append(address)
+        account_rows.append(
+            {
+                "account_number": f"{district_code[:2]}{i:07d}-001",
+                "account_name": f"Homeowner {i}",
+                "lot_number": f"Lot {i}",
+                "address_type": "Owner",
+                "service_address": address,
+                "normalized_service_address": AddressNormalizer.normalize(address),
+                "service_city_st_zip": "Mead, CO 80542",
+                "mail_address": address,
+                "mail_city_st_zip": "Mead, CO 80542",
+                "district_id": district.id,
+            }
+        )
+    db.session.bulk_insert_mappings(Account, account_rows)
+
+    for i in range(reports):
+        report = ViolationReport(
+            address_line1=rng.choice(addresses),
+            city="Mead",
+            state="CO",
+            zip_code="80542",
+            district=district_name,
+            created_at=INSPECTION_DATE,
+            updated_at=INSPECTION_DATE,
+        )
+        for j in range(violations_per_report):
+            violation = Violation(
+                violation_type=VIOLATION_TYPES[(i + j) % len(VIOLATION_TYPES)],
+                notes="",
+                created_at=INSPECTION_DATE,
+            )
+            violation.images.append(
+                ViolationImage(
+                    filename=f"violations/img_{i}_{j}",
+                    original_filename=f"img_{i}_{j}.jpg",
+                    file_path=f"https://res.cloudinary.com/demo/image/upload/violations/img_{i}_{j}.jpg",
+                    file_size=0,
+                    mime_type="image",
+                )
+            )
+            report.violations.append(violation)
+        db.session.add(report)
+
+    db.session.commit()
+    return district
@@ -3,17 +3,23 @@ Database package initialization
 """
 
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 
 # Initialize SQLAlchemy instance
 db = SQLAlchemy()
-migrate = Migrate()
 
 
-def init_db(app):
+def init_migrations(app):
+    """Register Flask-Migrate with the app (only migration tooling needs Alembic)"""
+    from flask_migrate import Migrate
+
+    return Migrate(app, db, directory="database/migrations")
+
+
+def init_db(app, migrations=False):
     """Initialize database with Flask app"""
     db.init_app(app)
-    migrate.init_app(app, db, directory="database/migrations")
+    if migrations:
+        init_migrations(app)
 
     print("Using database:", app.config["SQLALCHEMY_DATABASE_URI"])
 
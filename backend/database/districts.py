@@ -0,0 +1,30 @@
+"""
+The metropolitan districts this app serves.
+
+One table of district code -> (name, label), shared by the API (which gets the
+lowercase name from the frontend) and the roster batch import (which gets the
+code from the roster file name), so the two can't drift apart.
+"""
+
+# District code -> (name, label); name is also the frontend's district code
+KNOWN_DISTRICTS = {
+    "HMMD": ("highlands_mead", "Highlands Mead"),
+    "LVMD": ("littleton_village", "Littleton Village"),
+    "MFMD": ("muegge_farms", "Muegge Farms"),
+    "MSMD": ("mountain_sky", "Mountain Sky"),
+    "RBMD": ("red_barn", "Red Barn"),
+    "SRMD": ("saddler_ridge", "Saddler Ridge"),
+    "VMD": ("ventana", "Ventana"),
+    "WEMD": ("waters_edge", "Waters Edge"),
+    "WMD": ("winsome", "Winsome"),
+}
+
+# Frontend district code -> database district codes/names it may be stored under
+FRONTEND_DISTRICT_CODES = {
+    name: [name.upper(), code] for code, (name, _label) in KNOWN_DISTRICTS.items()
+}
+
+
+def district_lookup_codes(district_code):
+    """Database codes/names to try for a frontend district code."""
+    return FRONTEND_DISTRICT_CODES.get(district_code.lower(), [district_code.upper()])
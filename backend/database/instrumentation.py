@@ -0,0 +1,42 @@
+"""
+Query instrumentation helpers for measuring database round trips
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from database import db
+
+
+class QueryCounter:
+    """Counts SQL statements executed against an engine"""
+
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        self.count += 1
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine=None):
+    """
+    Count the SQL statements executed inside the block.
+
+    Usage:
+        with count_queries() as counter:
+            collector.collect_violation_data()
+        print(counter.count)
+    """
+    engine = engine or db.engine
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter._before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter._before_cursor_execute)
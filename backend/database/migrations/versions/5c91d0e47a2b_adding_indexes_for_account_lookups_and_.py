@@ -0,0 +1,50 @@
+"""Adding indexes for account lookups and violation foreign keys.
+
+Revision ID: 5c91d0e47a2b
+Revises: b3e7c21a9f40
+Create Date: 2026-10-17 10:03:27.904117
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "5c91d0e47a2b"
+down_revision = "b3e7c21a9f40"
+branch_labels = None
+depends_on = None
+
+ACTIVE_SERVICE_ADDRESS_CLAUSE = "service_address IS NOT NULL AND service_address <> ''"
+
+
+def upgrade():
+    with op.batch_alter_table("accounts", schema=None) as batch_op:
+        batch_op.create_index("ix_accounts_district_id", ["district_id"], unique=False)
+        batch_op.create_index(
+            "ix_accounts_active_district_service_address",
+            ["district_id", "service_address"],
+            unique=False,
+            postgresql_where=sa.text(ACTIVE_SERVICE_ADDRESS_CLAUSE),
+            sqlite_where=sa.text(ACTIVE_SERVICE_ADDRESS_CLAUSE),
+        )
+
+    with op.batch_alter_table("violations", schema=None) as batch_op:
+        batch_op.create_index("ix_violations_report_id", ["report_id"], unique=False)
+
+    with op.batch_alter_table("violation_images", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_violation_images_violation_id", ["violation_id"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("violation_images", schema=None) as batch_op:
+        batch_op.drop_index("ix_violation_images_violation_id")
+
+    with op.batch_alter_table("violations", schema=None) as batch_op:
+        batch_op.drop_index("ix_violations_report_id")
+
+    with op.batch_alter_table("accounts", schema=None) as batch_op:
+        batch_op.drop_index("ix_accounts_active_district_service_address")
+        batch_op.drop_index("ix_accounts_district_id")
@@ -0,0 +1,31 @@
+"""Adding a composite (district, created_at) index to violation_reports for inspection window queries.
+
+Revision ID: b3e7c21a9f40
+Revises: 8d016616c289
+Create Date: 2026-10-17 09:12:44.518203
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b3e7c21a9f40"
+down_revision = "8d016616c289"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("violation_reports", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_violation_reports_district_created_at",
+            ["district", "created_at"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("violation_reports", schema=None) as batch_op:
+        batch_op.drop_index("ix_violation_reports_district_created_at")
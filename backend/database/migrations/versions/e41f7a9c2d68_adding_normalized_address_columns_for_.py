@@ -0,0 +1,121 @@
+"""Adding normalized address columns for report to account matching.
+
+Revision ID: e41f7a9c2d68
+Revises: 5c91d0e47a2b
+Create Date: 2026-10-17 14:22:51.310245
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "e41f7a9c2d68"
+down_revision = "5c91d0e47a2b"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copy of utils.address_normalizer as of this revision, so replaying the
+# migration always stores the same values whatever the normalizer becomes.
+SUFFIX_MAP = {
+    "street": "st",
+    "avenue": "ave",
+    "boulevard": "blvd",
+    "drive": "dr",
+    "road": "rd",
+    "lane": "ln",
+    "court": "ct",
+    "place": "pl",
+    "trail": "trl",
+    "tr": "trl",
+    "parkway": "pkwy",
+    "circle": "cir",
+    "terrace": "ter",
+    "way": "wy",
+}
+PUNCTUATION = str.maketrans("", "", ".,")
+
+
+def _normalize(address):
+    """Normalize an address the way AddressNormalizer did at this revision."""
+    if not address or not isinstance(address, str):
+        return None
+    tokens = address.lower().translate(PUNCTUATION).split()
+    # The first token (usually the house number) is never a suffix
+    for position in range(1, len(tokens)):
+        tokens[position] = SUFFIX_MAP.get(tokens[position], tokens[position])
+    return " ".join(tokens) or None
+
+
+def _backfill(table_name, source_column, target_column):
+    """Fill target_column with the normalized form of source_column in batches."""
+    table = sa.table(
+        table_name,
+        sa.column("id", sa.Integer),
+        sa.column(source_column, sa.String),
+        sa.column(target_column, sa.String),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(table.c.id, table.c[source_column])).fetchall()
+
+    update = (
+        table.update()
+        .where(table.c.id == sa.bindparam("row_id"))
+        .values({target_column: sa.bindparam("normalized")})
+    )
+    for offset in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        batch = rows[offset : offset + BACKFILL_BATCH_SIZE]
+        connection.execute(
+            update,
+            [
+                {
+                    "row_id": row_id,
+                    "normalized": _normalize(address),
+                }
+                for row_id, address in batch
+            ],
+        )
+
+
+def upgrade():
+    with op.batch_alter_table("accounts", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "normalized_service_address", sa.String(length=100), nullable=True
+            )
+        )
+
+    with op.batch_alter_table("violation_reports", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("normalized_address_line1", sa.String(length=255), nullable=True)
+        )
+
+    _backfill("accounts", "service_address", "normalized_service_address")
+    _backfill("violation_reports", "address_line1", "normalized_address_line1")
+
+    # Build the indexes after the backfill instead of updating them row by row
+    with op.batch_alter_table("accounts", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_accounts_district_normalized_service_address",
+            ["district_id", "normalized_service_address"],
+            unique=False,
+        )
+
+    with op.batch_alter_table("violation_reports", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_violation_reports_normalized_address_line1",
+            ["normalized_address_line1"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("violation_reports", schema=None) as batch_op:
+        batch_op.drop_index("ix_violation_reports_normalized_address_line1")
+        batch_op.drop_column("normalized_address_line1")
+
+    with op.batch_alter_table("accounts", schema=None) as batch_op:
+        batch_op.drop_index("ix_accounts_district_normalized_service_address")
+        batch_op.drop_column("normalized_service_address")
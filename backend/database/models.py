@@ -4,8 +4,15 @@ Database models for the violation reporting system
 
 from database import db
 from datetime import datetime
+from sqlalchemy.orm import validates
+from utils.address_normalizer import AddressNormalizer
+from utils.roster_version import bump_roster_version
+from utils.storage import get_storage
 from typing import Dict, Any
 
+# Partial index predicate for accounts that have a usable service address
+ACTIVE_SERVICE_ADDRESS_CLAUSE = "service_address IS NOT NULL AND service_address <> ''"
+
 # temporary backdate for Muegge Farms data
 backdate = datetime(2025, 5, 30, 20, 58, 55, 211029)  # 2025-05-30 20:58:55.211029
 
@@ -14,6 +21,10 @@ class ViolationReport(db.Model):
     """Main violation report model"""
 
     __tablename__ = "violation_reports"
+    __table_args__ = (
+        # Letter runs filter by district and an inspection window on created_at
+        db.Index("ix_violation_reports_district_created_at", "district", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -24,6 +35,8 @@ class ViolationReport(db.Model):
     state = db.Column(db.String(50), nullable=False)
     zip_code = db.Column(db.String(20), nullable=False)
     district = db.Column(db.String(100), nullable=False)
+    # AddressNormalizer form of address_line1, matched against accounts
+    normalized_address_line1 = db.Column(db.String(255), nullable=True, index=True)
 
     # Report metadata
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -39,6 +52,11 @@ class ViolationReport(db.Model):
         "Violation", backref="report", lazy=True, cascade="all, delete-orphan"
     )
 
+    @validates("address_line1")
+    def _normalize_address_line1(self, key, value):
+        self.normalized_address_line1 = AddressNormalizer.normalize(value) or None
+        return value
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary"""
         return {
@@ -71,6 +89,7 @@ class Violation(db.Model):
         db.Integer,
         db.ForeignKey("violation_reports.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     violation_type = db.Column(db.String(255), nullable=False)
     notes = db.Column(db.Text, nullable=True)
@@ -102,7 +121,10 @@ class ViolationImage(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     violation_id = db.Column(
-        db.Integer, db.ForeignKey("violations.id", ondelete="CASCADE"), nullable=False
+        db.Integer,
+        db.ForeignKey("violations.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     filename = db.Column(db.String(255), nullable=False)
     original_filename = db.Column(db.String(255), nullable=False)
@@ -120,7 +142,7 @@ class ViolationImage(db.Model):
             "file_size": self.file_size,
             "mime_type": self.mime_type,
             "uploaded_at": self.uploaded_at.isoformat(),
-            "url": f"/api/images/{self.filename}",
+            "url": get_storage().url(self.filename),
         }
 
     def __repr__(self):
@@ -176,6 +198,22 @@ class Account(db.Model):
     """
 
     __tablename__ = "accounts"
+    __table_args__ = (
+        # Autocomplete only lists accounts with a service address, sorted by it
+        db.Index(
+            "ix_accounts_active_district_service_address",
+            "district_id",
+            "service_address",
+            postgresql_where=db.text(ACTIVE_SERVICE_ADDRESS_CLAUSE),
+            sqlite_where=db.text(ACTIVE_SERVICE_ADDRESS_CLAUSE),
+        ),
+        # Letter runs join reports to accounts on the normalized address
+        db.Index(
+            "ix_accounts_district_normalized_service_address",
+            "district_id",
+            "normalized_service_address",
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     account_number = db.Column(
@@ -191,6 +229,8 @@ class Account(db.Model):
     # Service address fields
     service_address = db.Column(db.String(100), nullable=True)
     service_city_st_zip = db.Column(db.String(100), nullable=True)
+    # AddressNormalizer form of service_address, matched against reports
+    normalized_service_address = db.Column(db.String(100), nullable=True)
 
     # Mailing address fields
     mail_address = db.Column(db.String(100), nullable=True)
@@ -201,7 +241,9 @@ class Account(db.Model):
     ebill_username = db.Column(db.String(100), nullable=True)
 
     # Foreign keys
-    district_id = db.Column(db.Integer, db.ForeignKey("districts.id"), nullable=False)
+    district_id = db.Column(
+        db.Integer, db.ForeignKey("districts.id"), nullable=False, index=True
+    )
 
     # Relationships
     history = db.relationship(
@@ -211,6 +253,11 @@ class Account(db.Model):
         "ContactPreference", backref="account", lazy=True, cascade="all, delete-orphan"
     )
 
+    @validates("service_address")
+    def _normalize_service_address(self, key, value):
+        self.normalized_service_address = AddressNormalizer.normalize(value) or None
+        return value
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary"""
         return {
@@ -302,24 +349,12 @@ class ContactPreference(db.Model):
 
 
 # Helper function to import data from Excel to database
-def import_excel_to_db(
-    excel_path, district_code, district_name=None, district_label=None
-):
+def get_or_create_district(district_code, district_name=None, district_label=None):
     """
-    Import data from Excel file to database.
+    Look up a district by code, creating it if it does not exist yet.
 
-    Args:
-        excel_path: Path to Excel file
-        district_code: District code (e.g., "WEMD" or "HMMD")
-        district_name: Name of the district (will prompt if not provided)
-        district_label: Optional label for the district (e.g., "Highland Mead")
+    Prompts for the name and label of a new district when they are not given.
     """
-    import pandas as pd
-
-    print(f"Starting import from: {excel_path}")
-    print(f"Using district code: {district_code}")
-
-    # Check if district exists, create if not
     district = District.query.filter_by(code=district_code).first()
     if not district:
         print(f"District '{district_code}' not found in database.")
@@ -340,40 +375,133 @@ def import_excel_to_db(
         db.session.commit()
     else:
         print(f"Found district: {district.name} ({district.code})")
+    return district
 
-    # Read Excel file
-    print("Reading Excel file...")
-    df = pd.read_excel(excel_path)
-    print(f"Loaded {len(df)} rows from Excel.")
-
-    # Import accounts
-    added = 0
-    for idx, row in df.iterrows():
-        if clean_value(row["Address Type"]) != "Owner":
-            continue  # Only import records where Address Type is 'Owner'
-        account = Account(
-            account_number=clean_value(row["Account Number"]),
-            account_name=clean_value(row["Account Name"]),
-            lot_number=clean_value(row["Lot Number"]),
-            move_in_date=clean_value(row["Move In Date"]),
-            address_type=clean_value(row["Address Type"]),
-            service_address=clean_value(row["ServiceAddress"]),
-            service_city_st_zip=clean_value(row["SvcCitySTZip"]),
-            mail_address=clean_value(row["MailAddress"]),
-            mail_city_st_zip=clean_value(row["MailCitySTZip"]),
-            email=clean_value(row["Email"]),
-            ebill_username=clean_value(row["EBill Username"]),
-            district_id=district.id,
-        )
-        db.session.add(account)
-        added += 1
-        if added % 100 == 0:
-            print(f"Processed {added} accounts...")
 
-    db.session.commit()
+def _report_import(district, stats):
+    """Print the summary of one district's roster import."""
+    if "inserted" in stats:
+        added = stats["inserted"]
+        print(
+            f"Incremental import: {stats['inserted']} new, {stats['updated']} changed, "
+            f"{stats['unchanged']} unchanged, {stats['history']} history entries."
+        )
+        if stats["conflicts"]:
+            print(
+                f"Skipped {stats['conflicts']} accounts that belong to another district."
+            )
+    else:
+        added = stats["rows"]
     print(
         f"Import complete. {added} accounts added to district '{district.name}' ({district.code})."
     )
+    print(
+        f"Read {stats['rows_read']} rows in {stats['chunks']} chunks, processed "
+        f"{stats['rows']} rows in {stats['seconds']:.2f}s "
+        f"({stats['rows_per_second']:.0f} rows/s)."
+    )
+
+
+def import_excel_to_db(
+    excel_path,
+    district_code,
+    district_name=None,
+    district_label=None,
+    batch_size=1000,
+    incremental=False,
+    chunk_size=5000,
+    sheet_name=None,
+):
+    """
+    Import data from Excel file to database.
+
+    The roster is streamed in chunks of chunk_size rows, each cleaned and
+    written before the next is read. CSV and Parquet rosters are accepted too.
+
+    Args:
+        excel_path: Path to Excel file (or .csv/.parquet roster)
+        district_code: District code (e.g., "WEMD" or "HMMD")
+        district_name: Name of the district (will prompt if not provided)
+        district_label: Optional label for the district (e.g., "Highland Mead")
+        batch_size: Number of accounts written per executemany batch
+        incremental: Upsert only new/changed rows and record field changes in
+            AccountHistory, so the roster can be re-imported safely
+        chunk_size: Number of spreadsheet rows read and cleaned at a time
+        sheet_name: Worksheet to import (default: the active sheet)
+    """
+    from database.roster_import import import_roster_chunks, iter_roster_chunks
+
+    print(f"Starting import from: {excel_path}")
+    print(f"Using district code: {district_code}")
+
+    # Check if district exists, create if not
+    district = get_or_create_district(district_code, district_name, district_label)
+
+    print("Streaming roster file...")
+    chunks = iter_roster_chunks(
+        excel_path, chunk_size=chunk_size, sheet_name=sheet_name
+    )
+    stats = import_roster_chunks(
+        chunks, district.id, batch_size=batch_size, incremental=incremental
+    )
+
+    db.session.commit()
+    # Invalidate cached account payloads and search indexes in every process
+    bump_roster_version()
+    _report_import(district, stats)
+    return stats
+
+
+def import_workbook_to_db(
+    excel_path,
+    sheet_districts,
+    batch_size=1000,
+    incremental=False,
+    chunk_size=5000,
+):
+    """
+    Import several district sheets from one workbook in a single pass.
+
+    Args:
+        excel_path: Path to the Excel workbook
+        sheet_districts: Mapping of sheet name -> district code, or
+            sheet name -> (district code, district name, district label)
+        batch_size: Number of accounts written per executemany batch
+        incremental: Upsert only new/changed rows (see import_excel_to_db)
+        chunk_size: Number of spreadsheet rows read and cleaned at a time
+
+    Returns:
+        dict: Import stats per sheet name
+    """
+    from itertools import groupby
+
+    from database.roster_import import import_roster_chunks, iter_workbook_chunks
+
+    print(f"Starting workbook import from: {excel_path}")
+
+    districts = {}
+    for sheet_name, target in sheet_districts.items():
+        if isinstance(target, str):
+            target = (target,)
+        districts[sheet_name] = get_or_create_district(*target)
+
+    results = {}
+    chunks = iter_workbook_chunks(excel_path, list(sheet_districts), chunk_size)
+    for sheet_name, sheet_chunks in groupby(chunks, key=lambda item: item[0]):
+        district = districts[sheet_name]
+        print(f"Importing sheet '{sheet_name}' into {district.code}...")
+        stats = import_roster_chunks(
+            (chunk for _sheet, chunk in sheet_chunks),
+            district.id,
+            batch_size=batch_size,
+            incremental=incremental,
+        )
+        _report_import(district, stats)
+        results[sheet_name] = stats
+
+    db.session.commit()
+    bump_roster_version()
+    return results
 
 
 def clean_value(val):
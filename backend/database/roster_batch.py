@@ -0,0 +1,216 @@
+"""
+Batch import of every district roster in the datasets directory.
+
+Roster files are discovered by name (<CODE>_CL_<YYMMDD>.xlsx) and
+parsed in a process pool, since reading and cleaning spreadsheets is the
+CPU-bound part. Parsed records are handed back to the parent process, which
+is the single database writer: it bulk-writes each district as soon as its
+file is parsed, while the remaining files are still being parsed.
+"""
+
+import glob
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from database import db
+from database.districts import KNOWN_DISTRICTS
+from database.models import District, get_or_create_district
+from database.roster_import import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CHUNK_SIZE,
+    bulk_insert_accounts,
+    clean_roster_frame,
+    iter_roster_chunks,
+    upsert_accounts,
+)
+from utils.roster_version import bump_roster_version
+
+DEFAULT_DATASETS_DIR = "../datasets"
+
+# Roster file name: district code, "CL" export marker, export date. Suffixed
+# exports (e.g. MSMD_CL_250602_partial.xlsx) are not full rosters.
+ROSTER_FILE_PATTERN = re.compile(r"^(?P<code>[A-Z]+)_CL_(?P<date>\d{6})\.xlsx$")
+SUFFIXED_EXPORT_PATTERN = re.compile(r"^[A-Z]+_CL_\d{6}_.+\.xlsx$")
+
+
+def default_worker_count():
+    """Worker count from ROSTER_IMPORT_WORKERS, falling back to the CPU count."""
+    configured = os.environ.get("ROSTER_IMPORT_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    return os.cpu_count() or 1
+
+
+def discover_rosters(directory=DEFAULT_DATASETS_DIR):
+    """
+    Find the newest roster file per district code in a directory.
+
+    Office lock files (~$...) and files that do not follow the roster naming
+    scheme are ignored; suffixed exports such as partial rosters are skipped
+    with a note.
+
+    Returns:
+        dict: District code -> roster file path, ordered by code
+    """
+    newest = {}
+    for path in glob.glob(os.path.join(directory, "*.xlsx")):
+        name = os.path.basename(path)
+        if name.startswith("~$"):
+            continue
+        match = ROSTER_FILE_PATTERN.match(name)
+        if not match:
+            if SUFFIXED_EXPORT_PATTERN.match(name):
+                print(f"Skipping {name}: suffixed export, not a full roster")
+            continue
+        code, export_date = match.group("code"), match.group("date")
+        if code not in newest or export_date > newest[code][0]:
+            newest[code] = (export_date, path)
+
+    return {code: newest[code][1] for code in sorted(newest)}
+
+
+def parse_roster_file(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read and clean one roster file (runs in a worker process).
+
+    Returns:
+        dict: Cleaned account records (without district_id), rows read and
+            parse time
+    """
+    start = time.perf_counter()
+    records = []
+    rows_read = 0
+    for chunk in iter_roster_chunks(path, chunk_size=chunk_size):
+        rows_read += len(chunk)
+        records.extend(clean_roster_frame(chunk).to_dict("records"))
+
+    return {
+        "records": records,
+        "rows_read": rows_read,
+        "parse_seconds": time.perf_counter() - start,
+    }
+
+
+def _resolve_district(code):
+    """Existing district for code, or a new one from KNOWN_DISTRICTS; None if unknown."""
+    if code in KNOWN_DISTRICTS:
+        name, label = KNOWN_DISTRICTS[code]
+        return get_or_create_district(code, name, label)
+    return District.query.filter_by(code=code).first()
+
+
+def _write_district(district, records, batch_size, incremental):
+    """Write one district's parsed records and commit them as one transaction."""
+    for record in records:
+        record["district_id"] = district.id
+
+    if incremental:
+        stats = upsert_accounts(records, batch_size=batch_size)
+    else:
+        stats = bulk_insert_accounts(records, batch_size=batch_size)
+    db.session.commit()
+    return stats
+
+
+def import_all_rosters(
+    directory=DEFAULT_DATASETS_DIR,
+    workers=None,
+    incremental=True,
+    batch_size=DEFAULT_BATCH_SIZE,
+):
+    """
+    Import every roster in directory: parse in a process pool, write serially.
+
+    Args:
+        directory: Directory holding the <CODE>_CL_<date>.xlsx roster exports
+        workers: Parser processes (default: ROSTER_IMPORT_WORKERS or CPU count)
+        incremental: Upsert only new/changed rows (safe to re-run); when False,
+            rows are plain-inserted and the districts must be empty
+        batch_size: Number of accounts written per executemany batch
+
+    Returns:
+        list: One summary dict per district, ordered by district code
+    """
+    start = time.perf_counter()
+    rosters = discover_rosters(directory)
+    if not rosters:
+        print(f"No roster files found in {directory}")
+        return []
+
+    districts = {}
+    summaries = {}
+    for code, path in rosters.items():
+        summaries[code] = {
+            "code": code,
+            "file": os.path.basename(path),
+            "rows_read": 0,
+            "rows": 0,
+            "written": 0,
+            "parse_seconds": 0.0,
+            "write_seconds": 0.0,
+            "error": None,
+        }
+        district = _resolve_district(code)
+        if district is None:
+            summaries[code]["error"] = "unknown district code"
+        else:
+            districts[code] = district
+
+    workers = min(workers or default_worker_count(), max(len(districts), 1))
+    print(f"Parsing {len(districts)} roster files with {workers} worker(s)...")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(parse_roster_file, rosters[code]): code for code in districts
+        }
+        # The parent is the only writer; write each district as soon as it is parsed
+        for future in as_completed(futures):
+            code = futures[future]
+            summary = summaries[code]
+            try:
+                parsed = future.result()
+                summary["rows_read"] = parsed["rows_read"]
+                summary["parse_seconds"] = parsed["parse_seconds"]
+
+                stats = _write_district(
+                    districts[code], parsed["records"], batch_size, incremental
+                )
+                summary["rows"] = stats["rows"]
+                summary["written"] = (
+                    stats["inserted"] + stats["updated"]
+                    if incremental
+                    else stats["rows"]
+                )
+                summary["write_seconds"] = stats["seconds"]
+            except Exception as e:
+                db.session.rollback()
+                summary["error"] = str(e)
+
+    # Invalidate cached account payloads and search indexes in every process
+    bump_roster_version()
+
+    results = [summaries[code] for code in rosters]
+    print_import_summary(results, time.perf_counter() - start)
+    return results
+
+
+def print_import_summary(results, elapsed):
+    """Print a per-district table of rows and timings."""
+    print(
+        f"\n{'District':<8} {'File':<30} {'Read':>7} {'Owners':>7} {'Written':>8} "
+        f"{'Parse s':>8} {'Write s':>8}  Status"
+    )
+    for result in results:
+        status = f"❌ {result['error']}" if result["error"] else "✅"
+        print(
+            f"{result['code']:<8} {result['file']:<30} {result['rows_read']:>7} "
+            f"{result['rows']:>7} {result['written']:>8} "
+            f"{result['parse_seconds']:>8.2f} {result['write_seconds']:>8.2f}  {status}"
+        )
+    print(
+        f"\nProcessed {sum(r['rows'] for r in results)} owner rows "
+        f"({sum(r['written'] for r in results)} written) from "
+        f"{len(results)} rosters in {elapsed:.2f}s"
+    )
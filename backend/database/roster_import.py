@@ -0,0 +1,395 @@
+"""
+Bulk import engine for district account rosters.
+
+Rosters are cleaned as whole pandas columns (NaN/NaT/blank -> None, owner rows
+only) and written with batched executemany inserts instead of one ORM object
+per row. Re-imports can run incrementally: incoming rows are hashed and
+compared in bulk with the stored accounts, and only new or changed rows are
+upserted, with one AccountHistory entry per changed field.
+
+Rosters are streamed: Excel sheets are read with openpyxl in read-only mode,
+CSV and Parquet files in row batches, and every chunk is cleaned and written
+before the next one is read, so memory stays flat regardless of file size.
+"""
+
+import hashlib
+import os
+import time
+from datetime import datetime
+
+from sqlalchemy import bindparam, select
+
+from database import db
+from database.models import Account, AccountHistory
+from utils.address_normalizer import AddressNormalizer
+
+# Roster spreadsheet column -> Account column
+ROSTER_COLUMNS = {
+    "Account Number": "account_number",
+    "Account Name": "account_name",
+    "Lot Number": "lot_number",
+    "Move In Date": "move_in_date",
+    "Address Type": "address_type",
+    "ServiceAddress": "service_address",
+    "SvcCitySTZip": "service_city_st_zip",
+    "MailAddress": "mail_address",
+    "MailCitySTZip": "mail_city_st_zip",
+    "Email": "email",
+    "EBill Username": "ebill_username",
+}
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Spreadsheet rows read, cleaned and written per streamed chunk
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def _sheet_chunks(worksheet, chunk_size):
+    """Yield raw DataFrames of up to chunk_size rows from a read-only worksheet."""
+    import pandas as pd
+
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+    header = [str(name).strip() if name is not None else "" for name in header]
+    width = len(header)
+
+    chunk = []
+    for row in rows:
+        if all(value is None for value in row):
+            continue
+        # Read-only sheets can report short or over-wide rows; square them up
+        row = tuple(row[:width]) + (None,) * (width - len(row))
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield pd.DataFrame(chunk, columns=header)
+            chunk = []
+    if chunk:
+        yield pd.DataFrame(chunk, columns=header)
+
+
+def iter_workbook_chunks(path, sheet_names=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream one or more sheets of a workbook in a single pass.
+
+    Args:
+        path: Path to an .xlsx workbook
+        sheet_names: Sheets to read, in order (default: the active sheet)
+        chunk_size: Rows per yielded DataFrame
+
+    Yields:
+        tuple: (sheet name, raw DataFrame chunk with spreadsheet columns)
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet_names is None:
+            sheet_names = [workbook.active.title]
+        missing = [name for name in sheet_names if name not in workbook.sheetnames]
+        if missing:
+            raise ValueError(f"Workbook has no sheet(s): {', '.join(missing)}")
+
+        for sheet_name in sheet_names:
+            for chunk in _sheet_chunks(workbook[sheet_name], chunk_size):
+                yield sheet_name, chunk
+    finally:
+        workbook.close()
+
+
+def iter_roster_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, sheet_name=None):
+    """
+    Stream a roster file (.xlsx, .csv or .parquet) as raw DataFrame chunks.
+
+    Args:
+        path: Path to the roster file
+        chunk_size: Rows per yielded DataFrame
+        sheet_name: Worksheet to read for Excel files (default: the active sheet)
+    """
+    import pandas as pd
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        # Read everything as text so account numbers keep their leading zeros
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str)
+    elif extension == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet rosters require pyarrow (pip install pyarrow)")
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        sheet_names = [sheet_name] if sheet_name else None
+        for _sheet, chunk in iter_workbook_chunks(path, sheet_names, chunk_size):
+            yield chunk
+
+
+def clean_roster_frame(df):
+    """
+    Clean a raw roster DataFrame with column-wise operations.
+
+    Keeps only rows whose Address Type is "Owner", renames the spreadsheet
+    columns to Account columns and converts NaN, NaT and blank strings to None.
+
+    Returns:
+        DataFrame: Cleaned frame with object dtype, ready for to_dict("records")
+    """
+    import pandas as pd
+
+    missing = [column for column in ROSTER_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Roster is missing columns: {', '.join(missing)}")
+
+    df = df[list(ROSTER_COLUMNS)]
+    df = df[df["Address Type"] == "Owner"].rename(columns=ROSTER_COLUMNS)
+
+    df["move_in_date"] = pd.to_datetime(df["move_in_date"], errors="coerce")
+
+    text_columns = [column for column in df.columns if df[column].dtype == object]
+    for column in text_columns:
+        blank = df[column].astype("string").str.strip().eq("").fillna(False)
+        df.loc[blank.to_numpy(), column] = None
+
+    normalized = AddressNormalizer.normalize_many(df["service_address"])
+    df["normalized_service_address"] = normalized.where(normalized != "", None)
+
+    # Object dtype turns numpy scalars into Python values and lets None replace NaN/NaT
+    df = df.astype(object)
+    return df.where(df.notna(), None)
+
+
+def roster_records(df, district_id):
+    """Turn a cleaned roster frame into Account insert mappings."""
+    records = df.to_dict("records")
+    for record in records:
+        record["district_id"] = district_id
+    return records
+
+
+def bulk_insert_accounts(records, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Insert account mappings in batches using executemany.
+
+    Returns:
+        dict: Rows inserted, elapsed seconds and rows per second
+    """
+    start = time.perf_counter()
+    insert = Account.__table__.insert()
+
+    for offset in range(0, len(records), batch_size):
+        batch = records[offset : offset + batch_size]
+        db.session.execute(insert, batch)
+        print(f"Inserted {offset + len(batch)} of {len(records)} accounts...")
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": len(records),
+        "seconds": elapsed,
+        "rows_per_second": len(records) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+# Account columns compared (and upserted) on an incremental re-import
+TRACKED_FIELDS = list(ROSTER_COLUMNS.values()) + ["district_id"]
+
+# Columns computed from the roster: compared and upserted, but not recorded
+# in AccountHistory
+DERIVED_FIELDS = ["normalized_service_address"]
+
+# Keep IN (...) lists well under SQLite's bound parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+def _comparable(value):
+    """Normalize a value so database and spreadsheet representations compare equal."""
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def row_hash(row):
+    """Stable hash over the tracked and derived fields of an account mapping or row."""
+    digest = hashlib.sha1()
+    for field in TRACKED_FIELDS + DERIVED_FIELDS:
+        digest.update(repr(_comparable(row[field])).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def _load_existing(account_numbers):
+    """
+    Fetch stored accounts for the given account numbers, keyed by number.
+
+    Account numbers are unique across districts, so this looks in every
+    district; upsert_accounts reports matches from another district.
+    """
+    table = Account.__table__
+    existing = {}
+    for offset in range(0, len(account_numbers), LOOKUP_CHUNK_SIZE):
+        chunk = account_numbers[offset : offset + LOOKUP_CHUNK_SIZE]
+        rows = db.session.execute(
+            select(table).where(table.c.account_number.in_(chunk))
+        ).mappings()
+        for row in rows:
+            existing[row["account_number"]] = row
+    return existing
+
+
+def _upsert_statement():
+    """INSERT ... ON CONFLICT (account_number) DO UPDATE for dialects that support it."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+
+    stmt = insert(Account.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=["account_number"],
+        set_={field: stmt.excluded[field] for field in TRACKED_FIELDS + DERIVED_FIELDS},
+    )
+
+
+def _write_changes(inserts, updates, batch_size):
+    """Write new and changed accounts, using a native upsert where available."""
+    table = Account.__table__
+    upsert = _upsert_statement()
+
+    if upsert is not None:
+        changed = inserts + updates
+        for offset in range(0, len(changed), batch_size):
+            db.session.execute(upsert, changed[offset : offset + batch_size])
+        return
+
+    # Portable fallback: plain inserts plus keyed executemany updates
+    for offset in range(0, len(inserts), batch_size):
+        db.session.execute(table.insert(), inserts[offset : offset + batch_size])
+
+    update = (
+        table.update()
+        .where(table.c.account_number == bindparam("match_account_number"))
+        .values({field: bindparam(field) for field in TRACKED_FIELDS + DERIVED_FIELDS})
+    )
+    for offset in range(0, len(updates), batch_size):
+        batch = [
+            dict(record, match_account_number=record["account_number"])
+            for record in updates[offset : offset + batch_size]
+        ]
+        db.session.execute(update, batch)
+
+
+def upsert_accounts(records, batch_size=DEFAULT_BATCH_SIZE, changed_by="roster import"):
+    """
+    Incrementally apply a roster: insert new accounts, update changed ones.
+
+    Unchanged rows (same hash over TRACKED_FIELDS and DERIVED_FIELDS) are not
+    written at all.
+    Every changed field of an existing account is recorded in AccountHistory
+    in the same transaction. Rows whose account number already belongs to
+    another district are skipped and reported as conflicts, never moved.
+
+    Returns:
+        dict: Counts of inserted, updated, unchanged, conflicting and history
+            rows plus timings
+    """
+    start = time.perf_counter()
+
+    # Later rows win if a roster repeats an account number
+    incoming = {record["account_number"]: record for record in records}
+    existing = _load_existing(list(incoming))
+
+    inserts, updates, history, conflicts = [], [], [], []
+    change_date = datetime.utcnow()
+    for account_number, record in incoming.items():
+        stored = existing.get(account_number)
+        if stored is None:
+            inserts.append(record)
+            continue
+        if stored["district_id"] != record["district_id"]:
+            conflicts.append(account_number)
+            print(
+                f"Skipping account {account_number}: it belongs to district id "
+                f"{stored['district_id']}, not {record['district_id']}"
+            )
+            continue
+        if row_hash(stored) == row_hash(record):
+            continue
+
+        updates.append(record)
+        for field in TRACKED_FIELDS:
+            old_value = _comparable(stored[field])
+            new_value = _comparable(record[field])
+            if old_value != new_value:
+                history.append(
+                    {
+                        "account_id": stored["id"],
+                        "change_date": change_date,
+                        "field_changed": field,
+                        "old_value": old_value,
+                        "new_value": new_value,
+                        "changed_by": changed_by,
+                    }
+                )
+
+    _write_changes(inserts, updates, batch_size)
+    for offset in range(0, len(history), batch_size):
+        db.session.execute(
+            AccountHistory.__table__.insert(), history[offset : offset + batch_size]
+        )
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": len(incoming),
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "unchanged": len(incoming) - len(inserts) - len(updates) - len(conflicts),
+        "conflicts": len(conflicts),
+        "history": len(history),
+        "seconds": elapsed,
+        "rows_per_second": len(incoming) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def import_roster_chunks(
+    chunks, district_id, batch_size=DEFAULT_BATCH_SIZE, incremental=False
+):
+    """
+    Clean and write streamed roster chunks one at a time.
+
+    Only one chunk is held in memory at once. Nothing is committed here, so
+    the caller decides whether the whole roster lands in one transaction.
+
+    Returns:
+        dict: Stats of bulk_insert_accounts/upsert_accounts summed over all chunks
+    """
+    start = time.perf_counter()
+    totals = {"chunks": 0, "rows_read": 0, "rows": 0}
+    if incremental:
+        totals.update(inserted=0, updated=0, unchanged=0, conflicts=0, history=0)
+
+    for chunk in chunks:
+        totals["chunks"] += 1
+        totals["rows_read"] += len(chunk)
+        records = roster_records(clean_roster_frame(chunk), district_id)
+        if incremental:
+            stats = upsert_accounts(records, batch_size=batch_size)
+        else:
+            stats = bulk_insert_accounts(records, batch_size=batch_size)
+
+        for key, value in stats.items():
+            if key not in ("seconds", "rows_per_second"):
+                totals[key] = totals.get(key, 0) + value
+        print(f"Processed chunk {totals['chunks']} ({totals['rows_read']} rows read)")
+
+    elapsed = time.perf_counter() - start
+    totals["seconds"] = elapsed
+    totals["rows_per_second"] = totals["rows"] / elapsed if elapsed > 0 else 0.0
+    return totals
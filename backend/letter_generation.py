@@ -1,60 +1,172 @@
-import re
-from database.models import District, Account, ViolationReport
-from pdf_generator.generate_pdf import ViolationNoticePDF
-from utils.violation_codes import violations
-from datetime import datetime, date
+import json
+import os
+import time
+from itertools import groupby
+from database.models import District, Account, ViolationReport, Violation
+from database.instrumentation import count_queries
+from utils.address_normalizer import AddressNormalizer  # noqa: F401 (re-exported)
+from utils.fuzzy_address import FuzzyAddressMatcher
+from utils.violation_registry import get_registry
+from datetime import datetime, date, timedelta
 from database import db
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import selectinload
 
+# Report rows fetched per round trip while streaming violation groups
+REPORT_BATCH_SIZE = int(os.environ.get("REPORT_BATCH_SIZE", 500))
 
-class AddressNormalizer:
-    """Handles address normalization and matching logic."""
-
-    SUFFIX_MAP = {
-        " street": " st",
-        " avenue": " ave",
-        " boulevard": " blvd",
-        " drive": " dr",
-        " road": " rd",
-        " lane": " ln",
-        " court": " ct",
-        " place": " pl",
-        " trail": " trl",
-        " trail": " tr",
-        " parkway": " pkwy",
-        " circle": " cir",
-        " terrace": " ter",
-        " way": " wy",  # sometimes way or sometimes wy
-    }
+# Records when letters were last mailed per district (used by "since last mailing")
+MAILING_LOG_PATH = os.environ.get(
+    "MAILING_LOG_PATH", "pdf_generator/output/mailings.json"
+)
+
+
+class InspectionWindow:
+    """
+    Time window of inspections to include in a letter run.
+
+    The window is a list of half-open [start, end) datetime ranges. Consecutive
+    dates are merged, so a start/end range or a list of adjacent inspection days
+    compiles to a single sargable range predicate on ViolationReport.created_at.
+    """
+
+    def __init__(self, ranges):
+        if not ranges:
+            raise ValueError("An inspection window needs at least one date range")
+        self.ranges = ranges
+
+    @classmethod
+    def between(cls, start_date, end_date):
+        """All inspections from start_date through end_date (inclusive)."""
+        if end_date < start_date:
+            raise ValueError("Inspection window ends before it starts")
+        return cls(
+            [(cls._day_start(start_date), cls._day_start(end_date) + timedelta(days=1))]
+        )
+
+    @classmethod
+    def on_dates(cls, dates):
+        """Inspections on the given days, merging consecutive days into one range."""
+        ranges = []
+        for day in sorted(set(dates)):
+            start = cls._day_start(day)
+            end = start + timedelta(days=1)
+            if ranges and ranges[-1][1] >= start:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+            else:
+                ranges.append((start, end))
+        return cls(ranges)
+
+    @classmethod
+    def since(cls, start):
+        """Inspections at or after start (a date or datetime)."""
+        if not isinstance(start, datetime):
+            start = cls._day_start(start)
+        return cls([(start, None)])
 
     @classmethod
-    def normalize(cls, addr):
-        """Normalize address for consistent matching."""
-        if not addr:
-            return ""
-
-        addr = addr.strip().lower()
-        # Remove punctuation
-        addr = re.sub(r"[.,]", "", addr)
-        # Collapse multiple spaces
-        addr = re.sub(r"\s+", " ", addr)
-        # Remove trailing whitespace (again, in case replacements add it)
-        addr = addr.rstrip()
-
-        # Replace street suffixes
-        for long_form, short_form in cls.SUFFIX_MAP.items():
-            if addr.endswith(long_form):
-                addr = addr[: -len(long_form)] + short_form
-            addr = addr.replace(long_form + " ", short_form + " ")
-        # Final strip to ensure no trailing whitespace
-        return addr.strip()
+    def since_last_mailing(cls, district_name):
+        """Inspections created after the last recorded mailing for the district."""
+        last_mailing = get_last_mailing(district_name)
+        if last_mailing is None:
+            raise ValueError(f"No mailing recorded for district '{district_name}'")
+        return cls([(last_mailing, None)])
+
+    @classmethod
+    def from_params(cls, params, district_name):
+        """
+        Build a window from request/job parameters (ISO dates as strings).
+
+        Accepts {"since_last_mailing": true}, {"dates": [...]},
+        {"start_date": ..., "end_date": ...} or {"since": ...}; with none of
+        these the window is today. Raises ValueError on invalid input.
+        """
+        if params.get("since_last_mailing"):
+            return cls.since_last_mailing(district_name)
+        if params.get("dates"):
+            return cls.on_dates(date.fromisoformat(day) for day in params["dates"])
+        if params.get("start_date"):
+            start_date = date.fromisoformat(params["start_date"])
+            end_date = date.fromisoformat(
+                params.get("end_date") or params["start_date"]
+            )
+            return cls.between(start_date, end_date)
+        if params.get("since"):
+            return cls.since(datetime.fromisoformat(params["since"]))
+        return cls.on_dates([date.today()])
+
+    @staticmethod
+    def _day_start(day):
+        if isinstance(day, datetime):
+            day = day.date()
+        return datetime.combine(day, datetime.min.time())
+
+    def filter_clause(self, column):
+        """Compile the window into a filter expression on column."""
+        clauses = []
+        for start, end in self.ranges:
+            if end is None:
+                clauses.append(column >= start)
+            else:
+                clauses.append(and_(column >= start, column < end))
+        return clauses[0] if len(clauses) == 1 else or_(*clauses)
+
+    def __repr__(self):
+        return f"<InspectionWindow {self.ranges}>"
+
+
+def _load_mailing_log():
+    try:
+        with open(MAILING_LOG_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def get_last_mailing(district_name):
+    """Return the datetime of the last recorded mailing for a district, if any."""
+    recorded = _load_mailing_log().get(district_name)
+    return datetime.fromisoformat(recorded) if recorded else None
+
+
+def record_mailing(district_name, mailed_at=None):
+    """Record that letters were mailed for a district (defaults to now)."""
+    log = _load_mailing_log()
+    log[district_name] = (mailed_at or datetime.utcnow()).isoformat()
+
+    os.makedirs(os.path.dirname(MAILING_LOG_PATH) or ".", exist_ok=True)
+    tmp_path = f"{MAILING_LOG_PATH}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(log, f, indent=2)
+    os.replace(tmp_path, MAILING_LOG_PATH)
 
 
 class ViolationDataCollector:
     """Collects and processes violation data for PDF generation."""
 
-    def __init__(self, district_name):
+    def __init__(
+        self, district_name, eager=True, window=None, fuzzy=True, fuzzy_threshold=None
+    ):
+        """
+        Args:
+            district_name: District name as stored on ViolationReport.district
+            eager: Load violations and images for all reports in a constant number
+                of queries instead of lazily per report (default: True)
+            window: InspectionWindow of reports to include (default: today)
+            fuzzy: Fall back to fuzzy address matching for reports without an
+                exact account match (default: True)
+            fuzzy_threshold: Minimum fuzzy match confidence (default:
+                FUZZY_MATCH_THRESHOLD or 0.85)
+        """
         self.district_name = district_name
+        self.eager = eager
+        self.window = window or InspectionWindow.on_dates([date.today()])
+        self.fuzzy = fuzzy
+        self.fuzzy_threshold = fuzzy_threshold
         self.district = self._get_district()
+        self._fuzzy_matcher = None
+        # Reports whose best fuzzy candidate fell below the threshold
+        self.review_queue = []
 
     def _get_district(self):
         """Get district from database."""
@@ -63,28 +175,97 @@ class ViolationDataCollector:
             raise ValueError(f"District '{self.district_name}' not found in database")
         return district
 
-    def _get_accounts_lookup(self):
-        """Create normalized address lookup for accounts."""
-        accounts = Account.query.filter_by(district_id=self.district.id).all()
-        return {
-            AddressNormalizer.normalize(account.service_address): account
-            for account in accounts
-        }
-
     def _get_violation_reports(self):
-        """Get all violation reports for the district updated today."""
-        dates = [date(2025, 7, 31), date(2025, 7, 31)]
-        filters = []
-        for target_date in dates:
-            start_dt = datetime.combine(target_date, datetime.min.time())
-            end_dt = datetime.combine(target_date, datetime.max.time())
-            filters.append(
-                (ViolationReport.created_at >= start_dt)
-                & (ViolationReport.created_at <= end_dt)
+        """
+        Stream the district's violation reports inside the inspection window,
+        each paired with its matching account (or None).
+
+        Reports are matched to accounts in the database with one outer join on
+        the persisted normalized address columns. When several accounts share
+        an address (e.g. after an owner change) only the newest one is joined,
+        so every report comes back exactly once with a deterministic account.
+        Rows come back ordered by address and are fetched in batches of
+        REPORT_BATCH_SIZE, so all reports for one address are adjacent and the
+        full result is never held at once.
+        """
+        newest_accounts = (
+            db.session.query(
+                Account.normalized_service_address.label("address"),
+                func.max(Account.id).label("account_id"),
+            )
+            .filter(
+                Account.district_id == self.district.id,
+                Account.normalized_service_address.isnot(None),
+            )
+            .group_by(Account.normalized_service_address)
+            .subquery()
+        )
+        query = (
+            db.session.query(ViolationReport, Account)
+            .outerjoin(
+                newest_accounts,
+                newest_accounts.c.address == ViolationReport.normalized_address_line1,
+            )
+            .outerjoin(Account, Account.id == newest_accounts.c.account_id)
+            .filter(
+                ViolationReport.district == self.district_name,
+                self.window.filter_clause(ViolationReport.created_at),
+            )
+            .order_by(ViolationReport.address_line1, ViolationReport.id)
+        )
+        if self.eager:
+            query = query.options(
+                selectinload(ViolationReport.violations).selectinload(Violation.images)
             )
-        return ViolationReport.query.filter(
-            ViolationReport.district == self.district_name, (filters[0]) | (filters[1])
-        ).all()
+        return query.yield_per(REPORT_BATCH_SIZE)
+
+    def _get_fuzzy_matcher(self):
+        """Blocking index over the district's accounts, built on first use."""
+        if self._fuzzy_matcher is None:
+            accounts = Account.query.filter(
+                Account.district_id == self.district.id,
+                Account.normalized_service_address.isnot(None),
+            ).all()
+            self._fuzzy_matcher = FuzzyAddressMatcher(
+                ((account.normalized_service_address, account) for account in accounts),
+                threshold=self.fuzzy_threshold,
+            )
+        return self._fuzzy_matcher
+
+    def _fuzzy_match(self, report):
+        """
+        Find an account for a report without an exact address match.
+
+        Returns:
+            tuple: (account, confidence), or (None, None) when no candidate is
+                good enough; low-confidence candidates are added to review_queue
+        """
+        matcher = self._get_fuzzy_matcher()
+        candidate = matcher.best(report.normalized_address_line1)
+        if candidate is None:
+            return None, None
+
+        if candidate.confidence >= matcher.threshold:
+            print(
+                f"Fuzzy match: {report.address_line1} -> {candidate.item.service_address} "
+                f"(confidence {candidate.confidence:.2f})"
+            )
+            return candidate.item, candidate.confidence
+
+        self.review_queue.append(
+            {
+                "report_id": report.id,
+                "address": report.address_line1,
+                "candidate_account_number": candidate.item.account_number,
+                "candidate_address": candidate.item.service_address,
+                "confidence": round(candidate.confidence, 3),
+            }
+        )
+        print(
+            f"Needs review: {report.address_line1} ~ {candidate.item.service_address} "
+            f"(confidence {candidate.confidence:.2f})"
+        )
+        return None, None
 
     def _get_district_regulations(self, district_name, violation_type):
         """Fetch district regulations for a specific violation type."""
@@ -95,17 +276,19 @@ class ViolationDataCollector:
                 "title": "Other Violation",
                 "description": "No specific regulation available for this violation type.",
             }
-        try:
-            return {
-                "violation_name": violation_type,
-                "title": violations[district_name][violation_type]["title"],
-                "description": violations[district_name][violation_type]["description"],
-            }
-        except KeyError:
+        code = get_registry().get(district_name, violation_type)
+        if code is None:
             # If the violation type or district is not found, skip this violation
             return None
+        return {
+            "violation_name": violation_type,
+            "title": code.title,
+            "description": code.description,
+        }
 
-    def _create_pdf_data_package(self, account, report, violation):
+    def _create_pdf_data_package(
+        self, account, report, violation, match_confidence=1.0
+    ):
         """Create a complete data package for PDF generation."""
         violation_images = [
             {
@@ -154,86 +337,132 @@ class ViolationDataCollector:
             "report_status": report.status,
             "report_created_at": report.created_at.strftime("%Y-%m-%d"),
             "report_updated_at": report.updated_at.strftime("%Y-%m-%d"),
+            # Address match information (1.0 for an exact normalized match)
+            "match_confidence": match_confidence,
         }
 
     def collect_violation_data(self):
         """Main method to collect all violation data for PDF generation."""
-        print(f"Collecting violation data for: {self.district_name}")
+        with count_queries() as query_counter:
+            consolidated_data = list(self.iter_violation_groups())
+        print(f"Database queries executed: {query_counter.count}")
+        return consolidated_data
+
+    def iter_violation_groups(self):
+        """
+        Yield one list of PDF data packages per address as soon as it is complete.
 
-        account_lookup = self._get_accounts_lookup()
-        violation_reports = self._get_violation_reports()
+        Reports are streamed in address order, so a group is finished (and
+        yielded) when the next address starts. Renderers can consume this
+        directly and start writing letters before the district is collected.
+        """
+        print(f"Collecting violation data for: {self.district_name}")
 
-        # Dictionary to group violations by address
-        address_violations = {}
         matches_found = 0
-        processed_violations = (
-            set()
-        )  # Track processed violation IDs to prevent duplicates
+        fuzzy_matches = 0
+        group_count = 0
+        total_violations = 0
+
+        rows = self._get_violation_reports()
+        for address_key, address_rows in groupby(
+            rows, key=lambda row: row[0].address_line1
+        ):
+            violations_list = []
+            # Track processed violation IDs to prevent duplicates
+            processed_violations = set()
+
+            for report, account in address_rows:
+                print(
+                    f"Checking: {report.address_line1} -> {report.normalized_address_line1}"
+                )
 
-        for report in violation_reports:
-            normalized_address = AddressNormalizer.normalize(report.address_line1)
-            account = account_lookup.get(normalized_address)
+                match_confidence = 1.0
+                if account is None and self.fuzzy:
+                    account, match_confidence = self._fuzzy_match(report)
+                    if account:
+                        fuzzy_matches += 1
 
-            print(f"Checking: {report.address_line1} -> {normalized_address}")
+                if not account:
+                    print(f"No account match for: {report.address_line1}")
+                    continue
 
-            if account:
                 matches_found += 1
-                address_key = report.address_line1
-
-                # Process each violation in the report
-                for violation in report.violations:
-                    # Skip if violation type is not in the district regulations
-                    if (
-                        violation.violation_type == "other"
-                        or violation.violation_type == "bball_hoop"
-                    ):
-                        print(
-                            f"Skipping 'other' / 'bball_hoop' violation for: {report.address_line1}"
-                        )
-                        continue
-
-                    # Skip if we've already processed this violation ID
-                    if violation.id in processed_violations:
-                        print(
-                            f"Skipping duplicate violation ID {violation.id} for: {report.address_line1}"
-                        )
-                        continue
-
-                    processed_violations.add(violation.id)
-
-                    pdf_data = self._create_pdf_data_package(account, report, violation)
-
-                    # Add to address_violations dictionary
-                    if address_key not in address_violations:
-                        address_violations[address_key] = []
-
-                    address_violations[address_key].append(pdf_data)
-                    print(f"Added: {account.account_name} - {violation.violation_type}")
-                    if violation.notes:
-                        print(f"Notes: {violation.notes}")
-            else:
-                print(f"No account match for: {report.address_line1}")
+                violations_list.extend(
+                    self._report_data_packages(
+                        account, report, match_confidence, processed_violations
+                    )
+                )
 
-        # Convert the dictionary to a list of violation groups
-        consolidated_data = []
-        for address, violations_list in address_violations.items():
-            consolidated_data.append(violations_list)
+            if violations_list:
+                group_count += 1
+                total_violations += len(violations_list)
+                yield violations_list
 
-        print(f"Total address matches: {matches_found}")
-        print(f"Total addresses with violations: {len(consolidated_data)}")
-        total_violations = sum(len(violations) for violations in consolidated_data)
+        print(f"Total address matches: {matches_found} ({fuzzy_matches} fuzzy)")
+        if self.review_queue:
+            print(f"Low-confidence matches needing review: {len(self.review_queue)}")
+        print(f"Total addresses with violations: {group_count}")
         print(f"Total violations to process: {total_violations}")
 
-        return consolidated_data
+    def _report_data_packages(
+        self, account, report, match_confidence, processed_violations
+    ):
+        """Build the PDF data packages for one matched report."""
+        packages = []
+        for violation in report.violations:
+            # Skip if violation type is not in the district regulations
+            if (
+                violation.violation_type == "other"
+                or violation.violation_type == "bball_hoop"
+            ):
+                print(
+                    f"Skipping 'other' / 'bball_hoop' violation for: {report.address_line1}"
+                )
+                continue
+
+            # Skip if we've already processed this violation ID
+            if violation.id in processed_violations:
+                print(
+                    f"Skipping duplicate violation ID {violation.id} for: {report.address_line1}"
+                )
+                continue
+
+            processed_violations.add(violation.id)
+
+            packages.append(
+                self._create_pdf_data_package(
+                    account, report, violation, match_confidence
+                )
+            )
+            print(f"Added: {account.account_name} - {violation.violation_type}")
+            if violation.notes:
+                print(f"Notes: {violation.notes}")
+        return packages
 
 
 class PDFGenerator:
-    """Handles PDF generation from violation data."""
+    """
+    Handles PDF generation from violation data.
+
+    The PDF stack (ReportLab, PIL, the image cache) is imported inside each
+    method so that the API process, which only needs InspectionWindow and the
+    collector, never loads it.
+    """
 
     @staticmethod
     def generate_consolidated_pdfs(consolidated_data_list):
-        """Generate consolidated PDFs for all addresses with violations."""
+        """
+        Generate consolidated PDFs for all addresses with violations.
+
+        Accepts any iterable of violation groups, including the generator from
+        ViolationDataCollector.iter_violation_groups(), and renders each group
+        as soon as it arrives.
+        """
+        from pdf_generator.generate_pdf import ViolationNoticePDF
+        from pdf_generator.image_processing import image_cache_summary
+
         generated_count = 0
+        generator = ViolationNoticePDF()
 
         for violations_list in consolidated_data_list:
             if not violations_list:
@@ -243,7 +472,6 @@ class PDFGenerator:
             address = violations_list[0].get("property_address", "unknown")
 
             try:
-                generator = ViolationNoticePDF()
                 pdf_path = generator.generate_consolidated_pdf(violations_list)
                 print(f"Consolidated PDF generated for {address}: {pdf_path}")
                 generated_count += 1
@@ -251,11 +479,79 @@ class PDFGenerator:
                 print(f"Error generating consolidated PDF for {address}: {e}")
 
         print(f"Successfully generated {generated_count} consolidated PDFs")
+        print(image_cache_summary())
         return generated_count
 
+    @staticmethod
+    def generate_consolidated_pdfs_parallel(
+        consolidated_data_list, workers=None, chunk_size=None
+    ):
+        """
+        Generate consolidated PDFs across a process pool.
+
+        Returns a manifest with one entry per address (pdf_path, error, seconds).
+        """
+        from pdf_generator.render_pool import render_consolidated_parallel
+
+        start = time.perf_counter()
+        manifest = render_consolidated_parallel(
+            consolidated_data_list, workers=workers, chunk_size=chunk_size
+        )
+        elapsed = time.perf_counter() - start
+
+        for entry in manifest:
+            if entry["error"]:
+                print(
+                    f"Error generating consolidated PDF for {entry['address']}: {entry['error']}"
+                )
+
+        generated_count = sum(1 for entry in manifest if entry["pdf_path"])
+        rate = generated_count / elapsed if elapsed > 0 else 0.0
+        print(
+            f"Successfully generated {generated_count} consolidated PDFs "
+            f"in {elapsed:.1f}s ({rate:.1f} letters/s)"
+        )
+        return manifest
+
+    @staticmethod
+    def generate_merged_pdf(consolidated_data_list, letters_per_file=None):
+        """
+        Generate all consolidated letters into merged PDF files for printing.
+
+        Writes one PDF (or one per letters_per_file letters) plus a JSON index
+        of the starting page of each letter. Returns the list of files written.
+        """
+        from pdf_generator.generate_pdf import ViolationNoticePDF
+
+        start = time.perf_counter()
+        files = ViolationNoticePDF().generate_merged_pdf(
+            consolidated_data_list, letters_per_file=letters_per_file
+        )
+        elapsed = time.perf_counter() - start
+
+        for merged in files:
+            for error in merged["errors"]:
+                print(
+                    f"Error generating consolidated PDF for {error['address']}: {error['error']}"
+                )
+            if merged["pdf_path"]:
+                print(
+                    f"Merged PDF generated with {merged['letters']} letters "
+                    f"({merged['pages']} pages): {merged['pdf_path']}"
+                )
+
+        generated_count = sum(merged["letters"] for merged in files)
+        print(
+            f"Successfully generated {generated_count} letters in {len(files)} "
+            f"merged PDF(s) in {elapsed:.1f}s"
+        )
+        return files
+
     @staticmethod
     def generate_pdfs(data_list):
         """Generate individual PDFs for all violation data packages (legacy method)."""
+        from pdf_generator.generate_pdf import ViolationNoticePDF
+
         generated_count = 0
 
         for data_dict in data_list:
@@ -309,3 +605,10 @@ def generate_pdfs(data_list):
 def generate_consolidated_pdfs(consolidated_data_list):
     """Generate consolidated PDFs from grouped violation data list."""
     return PDFGenerator.generate_consolidated_pdfs(consolidated_data_list)
+
+
+def generate_consolidated_pdfs_parallel(consolidated_data_list, workers=None):
+    """Generate consolidated PDFs in parallel and return the per-address manifest."""
+    return PDFGenerator.generate_consolidated_pdfs_parallel(
+        consolidated_data_list, workers=workers
+    )
@@ -4,7 +4,6 @@ Database management script for handling migrations and database operations
 """
 import os
 import sys
-from flask_migrate import init, migrate, upgrade, downgrade, current, history
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -19,12 +18,14 @@ from database import db
 
 def create_migration_app():
     """Create app instance for migrations"""
-    app = create_app()
+    app = create_app(migrations=True)
     return app
 
 
 def init_migrations():
     """Initialize migration repository"""
+    from flask_migrate import init
+
     app = create_migration_app()
     with app.app_context():
         try:
@@ -36,6 +37,8 @@ def init_migrations():
 
 def create_migration(message=None):
     """Create a new migration"""
+    from flask_migrate import migrate
+
     app = create_migration_app()
     with app.app_context():
         try:
@@ -50,6 +53,8 @@ def create_migration(message=None):
 
 def run_migrations():
     """Apply pending migrations"""
+    from flask_migrate import upgrade
+
     app = create_migration_app()
     with app.app_context():
         try:
@@ -61,6 +66,8 @@ def run_migrations():
 
 def rollback_migration(revision=None):
     """Rollback to a specific migration"""
+    from flask_migrate import downgrade
+
     app = create_migration_app()
     with app.app_context():
         try:
@@ -75,6 +82,8 @@ def rollback_migration(revision=None):
 
 def show_current():
     """Show current migration"""
+    from flask_migrate import current
+
     app = create_migration_app()
     with app.app_context():
         try:
@@ -86,6 +95,8 @@ def show_current():
 
 def show_history():
     """Show migration history"""
+    from flask_migrate import history
+
     app = create_migration_app()
     with app.app_context():
         try:
@@ -123,6 +134,80 @@ def drop_tables():
             print(f"❌ Error dropping tables: {e}")
 
 
+def prewarm_images(district_name, window_params=None):
+    """
+    Pre-render print-ready image derivatives for a district's print run.
+
+    window_params takes the same keys as the letters endpoint (start_date,
+    end_date, since_last_mailing); without them the window is today.
+    """
+    app = create_migration_app()
+    with app.app_context():
+        try:
+            from letter_generation import InspectionWindow, ViolationDataCollector
+            from pdf_generator.image_prefetch import prefetch_images
+            from pdf_generator.image_processing import prewarm_derivatives
+
+            window = InspectionWindow.from_params(window_params or {}, district_name)
+            print(f"Inspection window: {window}")
+            collector = ViolationDataCollector(district_name, window=window)
+            consolidated_data = collector.collect_violation_data()
+            prefetch_images(consolidated_data)
+            summary = prewarm_derivatives(consolidated_data)
+            print(
+                f"✅ Pre-warmed {summary['images']} images: "
+                f"{summary['processed']} derivatives built, "
+                f"{summary['cached']} already cached, {summary['failed']} failed"
+            )
+        except Exception as e:
+            print(f"❌ Error pre-warming images: {e}")
+
+
+def import_all(directory=None, incremental=True):
+    """Import every district roster found in the datasets directory"""
+    app = create_migration_app()
+    with app.app_context():
+        try:
+            from database.roster_batch import DEFAULT_DATASETS_DIR, import_all_rosters
+
+            results = import_all_rosters(
+                directory or DEFAULT_DATASETS_DIR, incremental=incremental
+            )
+            failed = [result["code"] for result in results if result["error"]]
+            if failed:
+                print(f"❌ Import failed for: {', '.join(failed)}")
+            else:
+                print("✅ All rosters imported successfully!")
+        except Exception as e:
+            print(f"❌ Error importing rosters: {e}")
+
+
+def compile_violations():
+    """Validate utils/violation_codes.py and write the compiled registry"""
+    try:
+        from utils.violation_registry import compile_registry, write_artifact
+
+        registry = compile_registry()
+        for warning in registry.warnings:
+            print(f"⚠️  {warning}")
+        path = write_artifact(registry)
+        print(
+            f"✅ Compiled {len(registry)} violation codes for "
+            f"{len(registry.districts())} districts to {path}"
+        )
+    except Exception as e:
+        print(f"❌ Error compiling violation codes: {e}")
+
+
+def _option_value(args, flag):
+    """Value following flag in args (e.g. --start 2025-07-01), or None"""
+    if flag in args:
+        index = args.index(flag)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return None
+
+
 def main():
     """Main CLI interface"""
     if len(sys.argv) < 2:
@@ -137,6 +222,12 @@ Database Management Commands:
   history       - Show migration history  
   create-tables - Create all tables (dev only)
   drop-tables   - Drop all tables (DANGEROUS)
+  prewarm-images - Build print-ready image derivatives for a district
+                  (--start/--end YYYY-MM-DD or --since-last-mailing;
+                  default: today's inspections)
+  import-all    - Import every <CODE>_CL_<date>.xlsx roster in datasets/
+                  (incremental; add --insert-only for a plain bulk insert)
+  compile-violations - Validate violation codes and write the compiled registry
 
 Usage: python manage_db.py <command> [args]
 Examples:
@@ -144,6 +235,9 @@ Examples:
   python manage_db.py migrate "Add new column"
   python manage_db.py upgrade
   python manage_db.py downgrade
+  python manage_db.py prewarm-images winsome
+  python manage_db.py prewarm-images winsome --start 2025-07-28 --end 2025-07-31
+  python manage_db.py import-all ../datasets
         """
         )
         return
@@ -168,6 +262,30 @@ Examples:
         create_tables()
     elif command == "drop-tables":
         drop_tables()
+    elif command == "prewarm-images":
+        if len(sys.argv) < 3 or sys.argv[2].startswith("--"):
+            print(
+                "❌ Usage: python manage_db.py prewarm-images <district_name> "
+                "[--start YYYY-MM-DD [--end YYYY-MM-DD] | --since-last-mailing]"
+            )
+            return
+        options = sys.argv[3:]
+        prewarm_images(
+            sys.argv[2],
+            {
+                "start_date": _option_value(options, "--start"),
+                "end_date": _option_value(options, "--end"),
+                "since_last_mailing": "--since-last-mailing" in options,
+            },
+        )
+    elif command == "import-all":
+        args = [arg for arg in sys.argv[2:] if not arg.startswith("--")]
+        import_all(
+            args[0] if args else None,
+            incremental="--insert-only" not in sys.argv[2:],
+        )
+    elif command == "compile-violations":
+        compile_violations()
     else:
         print(f"❌ Unknown command: {command}")
 
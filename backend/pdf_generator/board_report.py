@@ -7,66 +7,36 @@ from reportlab.graphics.charts.barcharts import VerticalBarChart
 from collections import Counter
 from datetime import datetime
 from reportlab.platypus import Image as RLImage
-from PIL import Image as PILImage, ExifTags, ImageEnhance, ImageFilter
 import io
-import requests
 import os
 
+from pdf_generator.image_processing import (
+    BOARD_REPORT_GEOMETRY,
+    get_derivative,
+    image_cache_summary,
+)
+
 
 def _fetch_and_prepare_image(
-    image_url, max_width=180, max_height=240, quality=95, sharpen_factor=1.3
+    image_url,
+    max_width=BOARD_REPORT_GEOMETRY["max_width"],
+    max_height=BOARD_REPORT_GEOMETRY["max_height"],
+    quality=95,
+    sharpen_factor=BOARD_REPORT_GEOMETRY["sharpen_factor"],
+    cache_key=None,
 ):
     try:
-        response = requests.get(image_url)
-        response.raise_for_status()
-        img_data = response.content
-
-        pil_img = PILImage.open(io.BytesIO(img_data))
-
-        if pil_img.mode != "RGB":
-            pil_img = pil_img.convert("RGB")
-
-        try:
-            for orientation in ExifTags.TAGS.keys():
-                if ExifTags.TAGS[orientation] == "Orientation":
-                    break
-            exif = pil_img._getexif()
-            if exif is not None:
-                orientation_value = exif.get(orientation)
-                if orientation_value == 3:
-                    pil_img = pil_img.rotate(180, expand=True)
-                elif orientation_value == 6:
-                    pil_img = pil_img.rotate(270, expand=True)
-                elif orientation_value == 8:
-                    pil_img = pil_img.rotate(90, expand=True)
-        except Exception:
-            pass
-
-        width, height = pil_img.size
-        ratio = min(max_width / width, max_height / height, 1)
-        new_width = int(width * ratio)
-        new_height = int(height * ratio)
-
-        if width > new_width * 2 or height > new_height * 2:
-            intermediate_width = int(new_width * 1.5)
-            intermediate_height = int(new_height * 1.5)
-            intermediate_img = pil_img.resize(
-                (intermediate_width, intermediate_height), PILImage.LANCZOS
-            )
-            pil_img = intermediate_img.resize((new_width, new_height), PILImage.LANCZOS)
-        else:
-            pil_img = pil_img.resize((new_width, new_height), PILImage.LANCZOS)
-
-        if sharpen_factor > 1.0:
-            pil_img = pil_img.filter(ImageFilter.GaussianBlur(radius=0.5))
-            enhancer = ImageEnhance.Sharpness(pil_img)
-            pil_img = enhancer.enhance(sharpen_factor)
-
-        output_buffer = io.BytesIO()
-        pil_img.save(output_buffer, format="PNG", optimize=True)
-        output_buffer.seek(0)
+        img_data, new_width, new_height = get_derivative(
+            image_url,
+            max_width,
+            max_height,
+            sharpen_factor=sharpen_factor,
+            cache_key=cache_key,
+        )
 
-        reportlab_img = RLImage(output_buffer, width=new_width, height=new_height)
+        reportlab_img = RLImage(
+            io.BytesIO(img_data), width=new_width, height=new_height
+        )
         reportlab_img.hAlign = "CENTER"
 
         return reportlab_img
@@ -138,7 +108,9 @@ def generate_board_report(output_path, district_name, violations, date=None):
 
     for v in violations:
         for image_info in v.get("violation_images", []):
-            img = _fetch_and_prepare_image(image_info["file_path"])
+            img = _fetch_and_prepare_image(
+                image_info["file_path"], cache_key=image_info.get("filename")
+            )
             if img:
                 images.append(img)
 
@@ -148,3 +120,5 @@ def generate_board_report(output_path, district_name, violations, date=None):
         elements.append(Spacer(1, 12))
 
     doc.build(elements)
+
+    print(image_cache_summary())
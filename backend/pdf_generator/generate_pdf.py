@@ -1,7 +1,6 @@
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.colors import HexColor
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import (
+    Flowable,
     SimpleDocTemplate,
     Paragraph,
     Spacer,
@@ -12,146 +11,41 @@ from reportlab.platypus import (
 )
 from reportlab.lib.units import inch
 from datetime import datetime
+from itertools import islice
+import json
 import os
-from PIL import Image as PILImage, ExifTags, ImageEnhance, ImageFilter
 import io
-import requests
+
+from pdf_generator.image_processing import LETTER_GEOMETRY, get_derivative
+from pdf_generator.letter_template import (
+    district_flowables,
+    ensure_output_dir,
+    get_stylesheet,
+    regulation_flowable,
+)
+
+
+class LetterStart(Flowable):
+    """Zero-size marker that records the page a letter starts on when drawn."""
+
+    def __init__(self, entry):
+        super().__init__()
+        self.entry = entry
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        self.entry["start_page"] = self.canv.getPageNumber()
 
 
 class ViolationNoticePDF:
     def __init__(self, output_dir="pdf_generator/output"):
         """Initialize the PDF generator with output directory."""
-        self.output_dir = output_dir
-
-        # Create output directory if it doesn't exist
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
-
-        # Set up styles
-        self.styles = getSampleStyleSheet()
-        self.styles.add(
-            ParagraphStyle(
-                name="DistrictName",
-                fontName="Helvetica-Bold",
-                fontSize=18,
-                textColor=HexColor("#2a4d8f"),  # A nice blue
-                spaceAfter=0.15 * inch,
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="DistrictInfo",
-                fontName="Helvetica",
-                fontSize=10,
-                leading=12,
-                spaceAfter=0.1 * inch,
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="NoticeTitle",
-                fontName="Helvetica-Bold",
-                fontSize=14,
-                alignment=1,  # Center
-                spaceAfter=0.2 * inch,
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="Date",
-                fontName="Helvetica",
-                fontSize=10,
-                alignment=2,  # Right
-                spaceAfter=0.1 * inch,
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="Recipient",
-                fontName="Helvetica",
-                fontSize=10,
-                spaceAfter=0.1 * inch,
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="PropertyInfo",
-                fontName="Helvetica",
-                fontSize=10,
-                spaceAfter=0.05 * inch,
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="ViolationInfo",
-                fontName="Helvetica-Bold",
-                fontSize=10,
-                spaceAfter=0.1 * inch,
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="Content", fontName="Helvetica", fontSize=10, spaceAfter=0.1 * inch
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="Closing",
-                fontName="Helvetica",
-                fontSize=10,
-                spaceAfter=0.05 * inch,
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="Signature",
-                fontName="Helvetica-Bold",
-                fontSize=10,
-                spaceAfter=0.2 * inch,
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="ImageCaption",
-                fontName="Helvetica-Bold",
-                fontSize=10,
-                alignment=1,  # Center
-                spaceAfter=0.1 * inch,
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="RegulationCode",
-                fontName="Helvetica-Bold",
-                fontSize=12,
-                spaceAfter=0.05 * inch,
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="RegulationTitle",
-                fontName="Helvetica-Bold",
-                fontSize=11,
-                spaceAfter=0.05 * inch,
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="RegulationText",
-                fontName="Helvetica",
-                fontSize=10,
-                spaceAfter=0.2 * inch,
-                leading=12,
-            )
-        )
-        self.styles.add(
-            ParagraphStyle(
-                name="ViolationHeader",
-                fontName="Helvetica-Bold",
-                fontSize=12,
-                spaceAfter=0.1 * inch,
-            )
-        )
+        self.output_dir = ensure_output_dir(output_dir)
+
+        # Styles are built once per process and shared by every generator
+        self.styles = get_stylesheet()
 
     def _format_date(self, date_value):
         """
@@ -193,54 +87,25 @@ class ViolationNoticePDF:
         return str(date_value)
 
     def _fetch_and_prepare_image(
-        self, image_url, max_width=600, max_height=900, quality=95, sharpen_factor=1.0
+        self,
+        image_url,
+        max_width=LETTER_GEOMETRY["max_width"],
+        max_height=LETTER_GEOMETRY["max_height"],
+        quality=95,
+        sharpen_factor=LETTER_GEOMETRY["sharpen_factor"],
+        cache_key=None,
     ):
         try:
-            response = requests.get(image_url)
-            response.raise_for_status()
-            img_data = response.content
-
-            pil_img = PILImage.open(io.BytesIO(img_data))
-            if pil_img.mode != "RGB":
-                pil_img = pil_img.convert("RGB")
-
-            try:
-                for orientation in ExifTags.TAGS:
-                    if ExifTags.TAGS[orientation] == "Orientation":
-                        break
-                exif = pil_img._getexif()
-                if exif is not None:
-                    orientation_value = exif.get(orientation)
-                    if orientation_value == 3:
-                        pil_img = pil_img.rotate(180, expand=True)
-                    elif orientation_value == 6:
-                        pil_img = pil_img.rotate(270, expand=True)
-                    elif orientation_value == 8:
-                        pil_img = pil_img.rotate(90, expand=True)
-            except Exception:
-                pass
-
-            width, height = pil_img.size
-            ratio = min(max_width / width, max_height / height, 1)
-            new_width = int(width * ratio)
-            new_height = int(height * ratio)
-
-            if width > new_width * 2 or height > new_height * 2:
-                intermediate_img = pil_img.resize(
-                    (int(new_width * 1.5), int(new_height * 1.5)), PILImage.LANCZOS
-                )
-                pil_img = intermediate_img.resize(
-                    (new_width, new_height), PILImage.LANCZOS
-                )
-            else:
-                pil_img = pil_img.resize((new_width, new_height), PILImage.LANCZOS)
-
-            output_buffer = io.BytesIO()
-            pil_img.save(output_buffer, format="PNG", optimize=True)
-            output_buffer.seek(0)
+            img_data, _width, _height = get_derivative(
+                image_url,
+                max_width,
+                max_height,
+                sharpen_factor=sharpen_factor,
+                cache_key=cache_key,
+            )
 
             # Fixed display size (2"x3" = 144pt x 216pt)
-            reportlab_img = Image(output_buffer, width=144, height=216)
+            reportlab_img = Image(io.BytesIO(img_data), width=144, height=216)
             reportlab_img.hAlign = "CENTER"
 
             return reportlab_img
@@ -250,23 +115,10 @@ class ViolationNoticePDF:
 
     def _add_header_content(self, data, content):
         """Add the header content to the PDF (district info, recipient, etc.)"""
-        # District name (large and blue)
-        content.append(
-            Paragraph(
-                f"{data['district_label']} Metropolitan District",
-                self.styles["DistrictName"],
-            )
-        )
+        static = district_flowables(data["district_label"])
 
-        # District address block (standard style)
-        district_address_block = """c/o Public Alliance LLC<br/>
-                         7555 E. Hampden Ave., Suite 501<br/>
-                         Denver, CO 80231<br/>
-                         (720) 213-6621"""
-        content.append(Paragraph(district_address_block, self.styles["DistrictInfo"]))
-
-        # Notice title
-        content.append(Paragraph("Courtesy Notice", self.styles["NoticeTitle"]))
+        # District name, address block and notice title
+        content.extend(static.letterhead)
 
         # Format the date to ensure it's a string
         formatted_date = self._format_date(
@@ -315,12 +167,7 @@ class ViolationNoticePDF:
             )
 
         # Letter content
-        letter_content = f"""One of the primary responsibilities of {data['district_label']} Metropolitan District ("the District") is to protect the aesthetic appeal and property values
-        of the neighborhood. To accomplish this, certain Covenants and Design Guidelines have
-        been established by which homeowners and residents must abide. During a recent
-        inspection the following concerns were noted regarding your property and the District is asking for your
-        help in achieving compliance."""
-        content.append(Paragraph(letter_content, self.styles["Content"]))
+        content.extend(static.body)
 
         return content
 
@@ -346,10 +193,14 @@ class ViolationNoticePDF:
                 )
             )
 
-        # Dynamically insert newlines before each bullet point for better formatting
-        formatted_description = regulation["description"].replace("•", "<br/>•")
-
-        content.append(Paragraph(formatted_description, self.styles["RegulationText"]))
+        # Regulation texts repeat across letters, so their paragraphs are shared
+        content.append(
+            regulation_flowable(
+                violation_data.get("district_name"),
+                violation_data.get("violation_type"),
+                regulation["description"],
+            )
+        )
 
         # Add violation image if available
         if (
@@ -357,7 +208,9 @@ class ViolationNoticePDF:
             and len(violation_data["violation_images"]) > 0
         ):
             violation_image = violation_data["violation_images"][0]
-            img = self._fetch_and_prepare_image(violation_image["file_path"])
+            img = self._fetch_and_prepare_image(
+                violation_image["file_path"], cache_key=violation_image.get("filename")
+            )
             if img:
                 content.append(img)
                 content.append(
@@ -372,62 +225,13 @@ class ViolationNoticePDF:
 
     def _add_footer_content(self, data, content):
         """Add the footer content to the PDF (closing, signature, etc.)"""
-        content.append(
-            Paragraph(
-                """We ask that you remedy these matters within the next 30 days from the date of this letter.
-        Failure to do so may result in potential fines per the governing documents.""",
-                self.styles["Content"],
-            )
-        )
-
-        content.append(
-            Paragraph(
-                """If you have already resolved the above matters, we thank you for your prompt attention and
-        appreciate your help keeping the neighborhood looking its best.""",
-                self.styles["Content"],
-            )
-        )
-
-        # Closing
-        content.append(Paragraph("Sincerely,", self.styles["Closing"]))
-        content.append(
-            Paragraph(
-                f"{data['district_label']} Metropolitan District",
-                self.styles["Signature"],
-            )
-        )
+        content.extend(district_flowables(data["district_label"]).footer)
 
         return content
 
-    def generate_consolidated_pdf(self, violations_data):
-        """
-        Generate a consolidated PDF notice for multiple violations at the same address.
-
-        Args:
-            violations_data (list): List of violation data dictionaries for the same address
-
-        Returns:
-            str: Path to the generated PDF file
-        """
-        if not violations_data or len(violations_data) == 0:
-            raise ValueError("No violation data provided")
-
-        # Use the first violation's data for common information
-        first_data = violations_data[0]
-
-        # Generate a filename based on property address and date
-        safe_address = (
-            first_data["property_address"]
-            .replace(" ", "_")
-            .replace(",", "")
-            .replace(".", "")
-        )
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{safe_address}_{timestamp}.pdf"
-        output_path = os.path.join(self.output_dir, filename)
-
-        # Create the PDF document
-        doc = SimpleDocTemplate(
+    def _create_document(self, output_path):
+        """Create a letter-size document with the notice margins."""
+        return SimpleDocTemplate(
             output_path,
             pagesize=letter,
             rightMargin=0.5 * inch,
@@ -436,6 +240,14 @@ class ViolationNoticePDF:
             bottomMargin=0.5 * inch,
         )
 
+    def _consolidated_content(self, violations_data):
+        """Build the flowables for one consolidated letter."""
+        if not violations_data or len(violations_data) == 0:
+            raise ValueError("No violation data provided")
+
+        # Use the first violation's data for common information
+        first_data = violations_data[0]
+
         # Build the content
         content = []
 
@@ -466,11 +278,146 @@ class ViolationNoticePDF:
         # Add footer content (only once, after the last violation)
         content = self._add_footer_content(first_data, content)
 
+        return content
+
+    def generate_consolidated_pdf(self, violations_data):
+        """
+        Generate a consolidated PDF notice for multiple violations at the same address.
+
+        Args:
+            violations_data (list): List of violation data dictionaries for the same address
+
+        Returns:
+            str: Path to the generated PDF file
+        """
+        content = self._consolidated_content(violations_data)
+
+        # Generate a filename based on property address and date
+        safe_address = (
+            violations_data[0]["property_address"]
+            .replace(" ", "_")
+            .replace(",", "")
+            .replace(".", "")
+        )
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{safe_address}_{timestamp}.pdf"
+        output_path = os.path.join(ensure_output_dir(self.output_dir), filename)
+
         # Build the PDF
-        doc.build(content)
+        self._create_document(output_path).build(content)
 
         return output_path
 
+    def generate_merged_pdf(
+        self, consolidated_data_list, letters_per_file=None, basename="mail_merge"
+    ):
+        """
+        Generate consolidated letters for many addresses into merged PDF files.
+
+        All letters of a file are laid out in a single doc.build pass with a
+        page break between letters, so the document structure and the
+        Helvetica font resources are written once per file rather than once
+        per letter (the base-14 fonts are referenced, never embedded), and
+        identical images are stored once. Each PDF gets a JSON index sidecar
+        (same name, .json) listing the starting page and page count of every
+        letter, for the print vendor.
+
+        Args:
+            consolidated_data_list: Iterable of violation groups (one list per address)
+            letters_per_file: Letters per PDF file (default: all letters in one file)
+            basename: Prefix for the output file names
+
+        Returns:
+            list: One dict per file written (pdf_path, index_path, letters, pages,
+                errors), where errors lists letters that could not be built
+        """
+        groups = (group for group in consolidated_data_list if group)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        files = []
+        while True:
+            chunk = list(islice(groups, letters_per_file))
+            if not chunk:
+                break
+            if letters_per_file:
+                filename = f"{basename}_{timestamp}_{len(files) + 1:03d}.pdf"
+            else:
+                filename = f"{basename}_{timestamp}.pdf"
+            files.append(
+                self._build_merged_file(
+                    os.path.join(ensure_output_dir(self.output_dir), filename), chunk
+                )
+            )
+            if not letters_per_file:
+                break
+
+        return files
+
+    def _build_merged_file(self, output_path, violation_groups):
+        """Lay out a list of letters into one PDF and write its index sidecar."""
+        content = []
+        index = []
+        errors = []
+        for violations_data in violation_groups:
+            first_data = violations_data[0]
+            entry = {
+                "account_number": first_data.get("account_number"),
+                "homeowner_name": first_data.get("homeowner_name"),
+                "property_address": first_data.get("property_address"),
+                "violation_count": len(violations_data),
+                "start_page": None,
+                "page_count": None,
+            }
+            try:
+                letter_content = self._consolidated_content(violations_data)
+            except Exception as e:
+                errors.append({"address": entry["property_address"], "error": str(e)})
+                continue
+
+            if content:
+                content.append(PageBreak())
+            content.append(LetterStart(entry))
+            content.extend(letter_content)
+            index.append(entry)
+
+        if not index:
+            return {
+                "pdf_path": None,
+                "index_path": None,
+                "letters": 0,
+                "pages": 0,
+                "errors": errors,
+            }
+
+        doc = self._create_document(output_path)
+        doc.build(content)
+
+        # A letter runs until the next one starts (or the end of the file)
+        total_pages = doc.page
+        for entry, next_entry in zip(index, index[1:] + [None]):
+            end_page = next_entry["start_page"] - 1 if next_entry else total_pages
+            entry["page_count"] = end_page - entry["start_page"] + 1
+
+        index_path = f"{os.path.splitext(output_path)[0]}.json"
+        with open(index_path, "w") as f:
+            json.dump(
+                {
+                    "pdf": os.path.basename(output_path),
+                    "pages": total_pages,
+                    "letters": index,
+                },
+                f,
+                indent=2,
+            )
+
+        return {
+            "pdf_path": output_path,
+            "index_path": index_path,
+            "letters": len(index),
+            "pages": total_pages,
+            "errors": errors,
+        }
+
     def generate_pdf(self, data):
         """
         Generate a PDF notice for a single violation.
@@ -487,17 +434,10 @@ class ViolationNoticePDF:
         )
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{safe_address}_{timestamp}.pdf"
-        output_path = os.path.join(self.output_dir, filename)
+        output_path = os.path.join(ensure_output_dir(self.output_dir), filename)
 
         # Create the PDF document
-        doc = SimpleDocTemplate(
-            output_path,
-            pagesize=letter,
-            rightMargin=0.5 * inch,
-            leftMargin=0.5 * inch,
-            topMargin=0.5 * inch,
-            bottomMargin=0.5 * inch,
-        )
+        doc = self._create_document(output_path)
 
         # Build the content
         content = []
@@ -0,0 +1,180 @@
+"""
+On-disk cache for violation images shared by the letter and board report generators.
+
+Entries are keyed by the storage key (ViolationImage.filename, e.g. the
+Cloudinary public_id) when it is known, otherwise by the image URL. Keys are
+hashed into a sharded directory layout, writes are atomic (temp file + rename)
+and the cache is bounded in size with least-recently-used eviction based on
+file modification times.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+
+from pdf_generator.image_transport import get_transport
+
+DEFAULT_CACHE_DIR = "pdf_generator/cache/images"
+DEFAULT_MAX_MB = 1024
+
+
+class ImageCache:
+    """Size-bounded LRU cache of raw image bytes on the local filesystem."""
+
+    def __init__(
+        self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_MB * 1024 * 1024
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_downloaded = 0
+        self._current_bytes = None  # Computed lazily from disk on first write
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path_for(self, key):
+        """Map a cache key to its sharded file path."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest)
+
+    def get(self, key):
+        """Return cached bytes for key, or None on a miss."""
+        path = self._path_for(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Touch the entry so eviction treats it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def contains(self, key):
+        """Check whether key is cached without counting a hit or miss."""
+        return os.path.exists(self._path_for(key))
+
+    def put(self, key, data):
+        """Atomically store bytes for key and evict old entries if over budget."""
+        path = self._path_for(key)
+        shard_dir = os.path.dirname(path)
+        os.makedirs(shard_dir, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=shard_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            # An overwritten entry gives its old size back to the budget
+            try:
+                replaced_bytes = os.path.getsize(path)
+            except OSError:
+                replaced_bytes = 0
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._current_bytes is None:
+                self._current_bytes = self._disk_usage()
+            else:
+                self._current_bytes += len(data) - replaced_bytes
+            over_budget = self._current_bytes > self.max_bytes
+
+        if over_budget:
+            self._evict()
+
+    def fetch(self, url, key=None):
+        """Return image bytes for url, downloading and caching them on a miss."""
+        cache_key = key or url
+        data = self.get(cache_key)
+        if data is not None:
+            return data
+
+        data = get_transport().fetch(url)
+        self.store_downloaded(cache_key, data)
+        return data
+
+    def store_downloaded(self, key, data):
+        """Store freshly downloaded bytes, counting them as downloaded."""
+        with self._lock:
+            self.bytes_downloaded += len(data)
+        self.put(key, data)
+
+    def _iter_entries(self):
+        """Yield (path, size, mtime) for every cached file."""
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.startswith(".tmp-"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _disk_usage(self):
+        return sum(size for _path, size, _mtime in self._iter_entries())
+
+    def _evict(self):
+        """Remove least recently used entries until usage is under 90% of the budget."""
+        entries = sorted(self._iter_entries(), key=lambda entry: entry[2])
+        total = sum(size for _path, size, _mtime in entries)
+        target = int(self.max_bytes * 0.9)
+
+        evicted = 0
+        for path, size, _mtime in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self._current_bytes = total
+            self.evictions += evicted
+
+    def stats(self):
+        """Return hit/miss counters for reporting."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "bytes_downloaded": self.bytes_downloaded,
+            }
+
+
+_default_cache = None
+
+
+def get_image_cache():
+    """Return the process-wide image cache configured from the environment."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ImageCache(
+            cache_dir=os.environ.get("IMAGE_CACHE_DIR", DEFAULT_CACHE_DIR),
+            max_bytes=int(os.environ.get("IMAGE_CACHE_MAX_MB", DEFAULT_MAX_MB))
+            * 1024
+            * 1024,
+        )
+    return _default_cache
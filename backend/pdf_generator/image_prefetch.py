@@ -0,0 +1,143 @@
+"""
+Concurrent image prefetch stage for letter and board report runs.
+
+Gathers every violation image referenced by the consolidated data and
+downloads the ones missing from the image cache on a bounded thread pool.
+Downloads go through the shared image transport (pooled session, timeouts,
+retries), so rendering afterwards only reads from the local cache.
+
+prefetch_stream does the same for a streamed run: it downloads images a few
+address groups ahead of the renderer instead of before the run.
+"""
+
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from pdf_generator.image_cache import get_image_cache
+from pdf_generator.image_transport import get_transport
+
+DEFAULT_MAX_WORKERS = 8
+
+# Address groups buffered ahead of the consumer by prefetch_stream
+DEFAULT_LOOKAHEAD = 16
+
+
+def collect_image_refs(consolidated_data):
+    """Return unique (url, cache_key) pairs for every image in the consolidated data."""
+    refs = {}
+    for group in consolidated_data:
+        for violation_data in group:
+            for image in violation_data.get("violation_images", []):
+                url = image["file_path"]
+                key = image.get("filename") or url
+                refs.setdefault(key, url)
+    return [(url, key) for key, url in refs.items()]
+
+
+def _download(transport, url, key, cache):
+    """Download one image into the cache."""
+    try:
+        data = transport.fetch(url)
+    except Exception as e:
+        return 0, str(e)
+    cache.store_downloaded(key, data)
+    return len(data), None
+
+
+def prefetch_images(consolidated_data, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Download all images for a run concurrently before PDF layout starts.
+
+    Args:
+        consolidated_data: Violation groups from ViolationDataCollector.collect_violation_data
+        max_workers: Maximum number of concurrent downloads (capped at the transport pool size)
+
+    Returns:
+        dict: Summary with counts of cached, downloaded and failed images
+    """
+    start = time.perf_counter()
+    cache = get_image_cache()
+    transport = get_transport()
+    refs = collect_image_refs(consolidated_data)
+    pending = [(url, key) for url, key in refs if not cache.contains(key)]
+
+    summary = {
+        "total": len(refs),
+        "cached": len(refs) - len(pending),
+        "downloaded": 0,
+        "failed": 0,
+        "bytes": 0,
+        "errors": {},
+    }
+
+    if pending:
+        workers = max(1, min(max_workers, transport.pool_size, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_download, transport, url, key, cache): url
+                for url, key in pending
+            }
+            for future, url in futures.items():
+                size, error = future.result()
+                if error:
+                    summary["failed"] += 1
+                    summary["errors"][url] = error
+                else:
+                    summary["downloaded"] += 1
+                    summary["bytes"] += size
+
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    summary["transport"] = transport.metrics.snapshot()
+    print(
+        f"Prefetched {summary['downloaded']} images "
+        f"({summary['cached']} already cached, {summary['failed']} failed) "
+        f"in {summary['seconds']}s"
+    )
+    return summary
+
+
+def prefetch_stream(
+    groups, lookahead=DEFAULT_LOOKAHEAD, max_workers=DEFAULT_MAX_WORKERS
+):
+    """
+    Pass violation groups through, downloading their images ahead of the consumer.
+
+    Up to lookahead groups are buffered while their images download on a
+    bounded thread pool. A group is yielded once its downloads have finished,
+    so the renderer reads from the cache.
+
+    Args:
+        groups: Iterable of violation groups, e.g. ViolationDataCollector.iter_violation_groups()
+        lookahead: Number of groups downloaded ahead of the one being rendered
+        max_workers: Maximum number of concurrent downloads (capped at the transport pool size)
+    """
+    cache = get_image_cache()
+    transport = get_transport()
+    workers = max(1, min(max_workers, transport.pool_size))
+    requested = set()
+    buffered = deque()  # (group, download futures)
+
+    def ready(entry):
+        group, futures = entry
+        for future in futures:
+            _size, error = future.result()
+            if error:
+                print(f"Error prefetching image: {error}")
+        return group
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for group in groups:
+            futures = []
+            for url, key in collect_image_refs([group]):
+                if key in requested or cache.contains(key):
+                    continue
+                requested.add(key)
+                futures.append(pool.submit(_download, transport, url, key, cache))
+            buffered.append((group, futures))
+
+            if len(buffered) > lookahead:
+                yield ready(buffered.popleft())
+
+        while buffered:
+            yield ready(buffered.popleft())
@@ -0,0 +1,204 @@
+"""
+Print-ready image derivatives for the PDF generators.
+
+Decoding, EXIF rotation, the two-pass LANCZOS resize and PNG encoding are done
+once per photo per target geometry. The processed bytes are stored in a
+derivative cache keyed by (source image, max_width, max_height, sharpen_factor,
+output format), so later letters and board reports only read them back.
+"""
+
+import io
+import os
+
+from PIL import Image as PILImage, ExifTags, ImageEnhance, ImageFilter
+
+from pdf_generator.image_cache import ImageCache, get_image_cache
+
+DEFAULT_DERIVATIVE_CACHE_DIR = "pdf_generator/cache/derivatives"
+DEFAULT_DERIVATIVE_MAX_MB = 512
+
+# Geometries used by ViolationNoticePDF and generate_board_report respectively
+LETTER_GEOMETRY = {"max_width": 600, "max_height": 900, "sharpen_factor": 1.0}
+BOARD_REPORT_GEOMETRY = {"max_width": 180, "max_height": 240, "sharpen_factor": 1.3}
+PRINT_GEOMETRIES = [LETTER_GEOMETRY, BOARD_REPORT_GEOMETRY]
+
+# Resolve the EXIF orientation tag id once instead of scanning per image
+_ORIENTATION_TAG = next(
+    (tag for tag, name in ExifTags.TAGS.items() if name == "Orientation"), None
+)
+
+
+def _apply_exif_rotation(pil_img):
+    """Rotate the image according to its EXIF orientation, if any."""
+    try:
+        exif = pil_img._getexif()
+        if exif is not None:
+            orientation_value = exif.get(_ORIENTATION_TAG)
+            if orientation_value == 3:
+                pil_img = pil_img.rotate(180, expand=True)
+            elif orientation_value == 6:
+                pil_img = pil_img.rotate(270, expand=True)
+            elif orientation_value == 8:
+                pil_img = pil_img.rotate(90, expand=True)
+    except Exception:
+        pass
+    return pil_img
+
+
+def prepare_image_bytes(
+    img_data, max_width, max_height, sharpen_factor=1.0, output_format="PNG"
+):
+    """
+    Decode, rotate, resize and re-encode an image.
+
+    Returns:
+        tuple: (encoded bytes, width, height) of the processed image
+    """
+    pil_img = PILImage.open(io.BytesIO(img_data))
+    if pil_img.mode != "RGB":
+        pil_img = pil_img.convert("RGB")
+
+    pil_img = _apply_exif_rotation(pil_img)
+
+    width, height = pil_img.size
+    ratio = min(max_width / width, max_height / height, 1)
+    new_width = int(width * ratio)
+    new_height = int(height * ratio)
+
+    if width > new_width * 2 or height > new_height * 2:
+        intermediate_img = pil_img.resize(
+            (int(new_width * 1.5), int(new_height * 1.5)), PILImage.LANCZOS
+        )
+        pil_img = intermediate_img.resize((new_width, new_height), PILImage.LANCZOS)
+    else:
+        pil_img = pil_img.resize((new_width, new_height), PILImage.LANCZOS)
+
+    if sharpen_factor > 1.0:
+        pil_img = pil_img.filter(ImageFilter.GaussianBlur(radius=0.5))
+        enhancer = ImageEnhance.Sharpness(pil_img)
+        pil_img = enhancer.enhance(sharpen_factor)
+
+    output_buffer = io.BytesIO()
+    pil_img.save(output_buffer, format=output_format, optimize=True)
+
+    return output_buffer.getvalue(), new_width, new_height
+
+
+def derivative_key(source_key, max_width, max_height, sharpen_factor, output_format):
+    """Cache key for one processed rendition of a source image."""
+    return f"{source_key}|{max_width}x{max_height}|sharpen={sharpen_factor}|{output_format}"
+
+
+_derivative_cache = None
+
+
+def get_derivative_cache():
+    """Return the process-wide derivative cache configured from the environment."""
+    global _derivative_cache
+    if _derivative_cache is None:
+        _derivative_cache = ImageCache(
+            cache_dir=os.environ.get(
+                "IMAGE_DERIVATIVE_CACHE_DIR", DEFAULT_DERIVATIVE_CACHE_DIR
+            ),
+            max_bytes=int(
+                os.environ.get(
+                    "IMAGE_DERIVATIVE_CACHE_MAX_MB", DEFAULT_DERIVATIVE_MAX_MB
+                )
+            )
+            * 1024
+            * 1024,
+        )
+    return _derivative_cache
+
+
+def get_derivative(
+    image_url,
+    max_width,
+    max_height,
+    sharpen_factor=1.0,
+    output_format="PNG",
+    cache_key=None,
+):
+    """
+    Return a print-ready rendition of an image, processing it only on a cache miss.
+
+    Returns:
+        tuple: (encoded bytes, width, height)
+    """
+    cache = get_derivative_cache()
+    key = derivative_key(
+        cache_key or image_url, max_width, max_height, sharpen_factor, output_format
+    )
+
+    data = cache.get(key)
+    if data is not None:
+        # Opening only parses the header, which is all we need for the size
+        width, height = PILImage.open(io.BytesIO(data)).size
+        return data, width, height
+
+    source = get_image_cache().fetch(image_url, key=cache_key)
+    data, width, height = prepare_image_bytes(
+        source, max_width, max_height, sharpen_factor, output_format
+    )
+    cache.put(key, data)
+    return data, width, height
+
+
+def image_cache_summary():
+    """
+    One-line report of the image caches for the end of a print run.
+
+    Warm runs are served from the derivative cache without touching the source
+    image cache, so hits and misses are counted on derivatives; downloads come
+    from the source cache.
+    """
+    derivatives = get_derivative_cache().stats()
+    sources = get_image_cache().stats()
+    return (
+        f"Image cache: {derivatives['hits']} derivative hits, "
+        f"{derivatives['misses']} derivative misses, "
+        f"{sources['bytes_downloaded']} bytes downloaded"
+    )
+
+
+def prewarm_derivatives(consolidated_data, geometries=PRINT_GEOMETRIES):
+    """
+    Build every derivative a print run will need ahead of time.
+
+    Args:
+        consolidated_data: Violation groups from ViolationDataCollector.collect_violation_data
+        geometries: Target geometries to render (default: letter and board report)
+
+    Returns:
+        dict: Counts of images processed, already cached and failed
+    """
+    cache = get_derivative_cache()
+    summary = {"images": 0, "processed": 0, "cached": 0, "failed": 0}
+
+    for group in consolidated_data:
+        for violation_data in group:
+            for image in violation_data.get("violation_images", []):
+                summary["images"] += 1
+                for geometry in geometries:
+                    key = derivative_key(
+                        image.get("filename") or image["file_path"],
+                        geometry["max_width"],
+                        geometry["max_height"],
+                        geometry["sharpen_factor"],
+                        "PNG",
+                    )
+                    if cache.contains(key):
+                        summary["cached"] += 1
+                        continue
+                    try:
+                        get_derivative(
+                            image["file_path"],
+                            cache_key=image.get("filename"),
+                            **geometry,
+                        )
+                        summary["processed"] += 1
+                    except Exception as e:
+                        print(f"Error preparing image {image['file_path']}: {e}")
+                        summary["failed"] += 1
+
+    return summary
@@ -0,0 +1,224 @@
+"""
+Image transport for the PDF generators.
+
+All image downloads go through one transport per process. HttpTransport owns a
+single pooled keep-alive requests.Session with connect/read timeouts, retries
+with jittered exponential backoff and per-download metrics. LocalTransport is
+a drop-in stand-in that serves images from a local directory so batch runs can
+be exercised offline. StorageTransport reads images through the configured
+storage backend (utils/storage.py); it is the default with STORAGE_BACKEND=local,
+so local deployments render letters without any network access.
+"""
+
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5  # seconds, doubled on every retry
+
+
+class TransportMetrics:
+    """Thread-safe byte and latency counters for image downloads."""
+
+    def __init__(self):
+        self.downloads = 0
+        self.failures = 0
+        self.retries = 0
+        self.bytes = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, size, seconds):
+        with self._lock:
+            self.downloads += 1
+            self.bytes += size
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def snapshot(self):
+        """Return the current counters as a dictionary."""
+        with self._lock:
+            return {
+                "downloads": self.downloads,
+                "failures": self.failures,
+                "retries": self.retries,
+                "bytes": self.bytes,
+                "avg_seconds": (
+                    self.total_seconds / self.downloads if self.downloads else 0.0
+                ),
+                "max_seconds": self.max_seconds,
+            }
+
+
+class HttpTransport:
+    """Downloads images over a shared, pooled HTTP session."""
+
+    def __init__(
+        self,
+        pool_size=DEFAULT_POOL_SIZE,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        read_timeout=DEFAULT_READ_TIMEOUT,
+        retries=DEFAULT_RETRIES,
+        backoff=DEFAULT_BACKOFF,
+    ):
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.metrics = TransportMetrics()
+
+        self.session = requests.Session()
+        self.session.headers.update({"Connection": "keep-alive"})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def fetch(self, url):
+        """Return the bytes at url, retrying transient failures."""
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                status = getattr(e.response, "status_code", None)
+                # Client errors (other than rate limiting) will not succeed on retry
+                if attempt == self.retries or (
+                    status and status < 500 and status != 429
+                ):
+                    self.metrics.record_failure()
+                    raise
+                self.metrics.record_retry()
+                time.sleep(self.backoff * (2**attempt) * random.uniform(0.5, 1.5))
+                continue
+
+            data = response.content
+            self.metrics.record(len(data), time.perf_counter() - start)
+            return data
+
+    def close(self):
+        self.session.close()
+
+
+class LocalTransport:
+    """Offline stand-in that serves images by file name from a local directory."""
+
+    def __init__(self, root):
+        self.root = root
+        self.pool_size = DEFAULT_POOL_SIZE
+        self.metrics = TransportMetrics()
+
+    def fetch(self, url):
+        """Return the bytes of the local file matching the URL's file name."""
+        start = time.perf_counter()
+        path = os.path.join(self.root, os.path.basename(urlparse(url).path))
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self.metrics.record_failure()
+            raise
+        self.metrics.record(len(data), time.perf_counter() - start)
+        return data
+
+    def close(self):
+        pass
+
+
+class StorageTransport:
+    """Reads images through a storage backend, resolving URLs back to keys."""
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.pool_size = DEFAULT_POOL_SIZE
+        self.metrics = TransportMetrics()
+
+    def fetch(self, url):
+        """Return the bytes of the stored image a storage URL (or key) refers to."""
+        start = time.perf_counter()
+        key = self.storage.key_for_url(url) or url
+        try:
+            data = self.storage.get(key)
+        except Exception:
+            self.metrics.record_failure()
+            raise
+        self.metrics.record(len(data), time.perf_counter() - start)
+        return data
+
+    def close(self):
+        pass
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def _transport_from_env():
+    """Build the transport described by the IMAGE_TRANSPORT* environment variables."""
+    from utils.storage import get_storage, storage_backend_name
+
+    default = "storage" if storage_backend_name() == "local" else "http"
+    mode = os.environ.get("IMAGE_TRANSPORT", default).lower()
+    if mode == "local":
+        return LocalTransport(
+            os.environ.get("IMAGE_TRANSPORT_ROOT", "uploads/violation_images")
+        )
+    if mode == "storage":
+        return StorageTransport(get_storage())
+    return HttpTransport(
+        pool_size=int(os.environ.get("IMAGE_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE)),
+        connect_timeout=float(
+            os.environ.get("IMAGE_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)
+        ),
+        read_timeout=float(os.environ.get("IMAGE_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)),
+        retries=int(os.environ.get("IMAGE_FETCH_RETRIES", DEFAULT_RETRIES)),
+    )
+
+
+def get_transport():
+    """Return the process-wide image transport, creating it on first use."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = _transport_from_env()
+    return _transport
+
+
+def set_transport(transport):
+    """Replace the process-wide transport (e.g. with a LocalTransport for offline runs)."""
+    global _transport
+    with _transport_lock:
+        if _transport is not None and _transport is not transport:
+            _transport.close()
+        _transport = transport
+
+
+def _reset_after_fork():
+    """Give forked worker processes their own session instead of the parent's sockets."""
+    global _transport, _transport_lock
+    if isinstance(_transport, HttpTransport):
+        _transport = None
+    _transport_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
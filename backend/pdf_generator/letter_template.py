@@ -0,0 +1,260 @@
+"""
+Precompiled styles and district-level flowables for violation letters.
+
+The stylesheet is built once per process, and the paragraphs that only depend
+on the district (letterhead, notice title, letter body, closing) are parsed
+once per district_label and shared by every letter. Platypus lays out a
+flowable from scratch on every wrap() and leaves the parsed markup untouched,
+so one Paragraph instance can be drawn in any number of documents, one build
+at a time. Only the date, recipient block and violation sections are built
+per letter.
+
+Regulation texts are long and repeat across thousands of letters, so they are
+cached the same way per (district, violation type) as WrappedParagraphs, which
+also remember their line breaks per frame width: after the first letter a
+regulation costs a dictionary lookup to lay out.
+"""
+
+import os
+from functools import lru_cache
+from typing import List, NamedTuple
+
+from reportlab.lib.colors import HexColor
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Flowable, Paragraph
+
+DISTRICT_ADDRESS_BLOCK = """c/o Public Alliance LLC<br/>
+                         7555 E. Hampden Ave., Suite 501<br/>
+                         Denver, CO 80231<br/>
+                         (720) 213-6621"""
+
+
+class WrappedParagraph(Paragraph):
+    """
+    Paragraph that memoizes its line breaking per available width.
+
+    Paragraph.wrap ignores the available height when breaking lines, so the
+    result for a width can be reused every time the paragraph is laid out.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wrapped = {}
+
+    def wrap(self, availWidth, availHeight):
+        cached = self._wrapped.get(availWidth)
+        if cached is None:
+            size = super().wrap(availWidth, availHeight)
+            self._wrapped[availWidth] = (self.blPara, self._wrapWidths, size)
+            return size
+
+        # split() may have dropped blPara, so restore everything wrap would set
+        self.blPara, self._wrapWidths, size = cached
+        self.width, self.height = size
+        return size
+
+
+class DistrictFlowables(NamedTuple):
+    """Static paragraphs of a district's letter."""
+
+    letterhead: List[Flowable]  # district name, address block, notice title
+    body: List[Flowable]  # letter text after the recipient block
+    footer: List[Flowable]  # remedy text, closing and signature
+
+
+def build_stylesheet():
+    """Build the sample stylesheet plus the letter styles."""
+    styles = getSampleStyleSheet()
+    styles.add(
+        ParagraphStyle(
+            name="DistrictName",
+            fontName="Helvetica-Bold",
+            fontSize=18,
+            textColor=HexColor("#2a4d8f"),  # A nice blue
+            spaceAfter=0.15 * inch,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="DistrictInfo",
+            fontName="Helvetica",
+            fontSize=10,
+            leading=12,
+            spaceAfter=0.1 * inch,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="NoticeTitle",
+            fontName="Helvetica-Bold",
+            fontSize=14,
+            alignment=1,  # Center
+            spaceAfter=0.2 * inch,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="Date",
+            fontName="Helvetica",
+            fontSize=10,
+            alignment=2,  # Right
+            spaceAfter=0.1 * inch,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="Recipient",
+            fontName="Helvetica",
+            fontSize=10,
+            spaceAfter=0.1 * inch,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="PropertyInfo",
+            fontName="Helvetica",
+            fontSize=10,
+            spaceAfter=0.05 * inch,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="ViolationInfo",
+            fontName="Helvetica-Bold",
+            fontSize=10,
+            spaceAfter=0.1 * inch,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="Content", fontName="Helvetica", fontSize=10, spaceAfter=0.1 * inch
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="Closing",
+            fontName="Helvetica",
+            fontSize=10,
+            spaceAfter=0.05 * inch,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="Signature",
+            fontName="Helvetica-Bold",
+            fontSize=10,
+            spaceAfter=0.2 * inch,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="ImageCaption",
+            fontName="Helvetica-Bold",
+            fontSize=10,
+            alignment=1,  # Center
+            spaceAfter=0.1 * inch,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="RegulationCode",
+            fontName="Helvetica-Bold",
+            fontSize=12,
+            spaceAfter=0.05 * inch,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="RegulationTitle",
+            fontName="Helvetica-Bold",
+            fontSize=11,
+            spaceAfter=0.05 * inch,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="RegulationText",
+            fontName="Helvetica",
+            fontSize=10,
+            spaceAfter=0.2 * inch,
+            leading=12,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="ViolationHeader",
+            fontName="Helvetica-Bold",
+            fontSize=12,
+            spaceAfter=0.1 * inch,
+        )
+    )
+    return styles
+
+
+@lru_cache(maxsize=None)
+def get_stylesheet():
+    """Letter stylesheet shared by every generator in this process (read-only)."""
+    return build_stylesheet()
+
+
+@lru_cache(maxsize=64)
+def district_flowables(district_label):
+    """Parse the static paragraphs for a district once and reuse them."""
+    styles = get_stylesheet()
+    district = f"{district_label} Metropolitan District"
+
+    letterhead = [
+        WrappedParagraph(district, styles["DistrictName"]),
+        WrappedParagraph(DISTRICT_ADDRESS_BLOCK, styles["DistrictInfo"]),
+        WrappedParagraph("Courtesy Notice", styles["NoticeTitle"]),
+    ]
+
+    letter_content = f"""One of the primary responsibilities of {district} ("the District") is to protect the aesthetic appeal and property values
+        of the neighborhood. To accomplish this, certain Covenants and Design Guidelines have
+        been established by which homeowners and residents must abide. During a recent
+        inspection the following concerns were noted regarding your property and the District is asking for your
+        help in achieving compliance."""
+    body = [WrappedParagraph(letter_content, styles["Content"])]
+
+    footer = [
+        WrappedParagraph(
+            """We ask that you remedy these matters within the next 30 days from the date of this letter.
+        Failure to do so may result in potential fines per the governing documents.""",
+            styles["Content"],
+        ),
+        WrappedParagraph(
+            """If you have already resolved the above matters, we thank you for your prompt attention and
+        appreciate your help keeping the neighborhood looking its best.""",
+            styles["Content"],
+        ),
+        WrappedParagraph("Sincerely,", styles["Closing"]),
+        WrappedParagraph(district, styles["Signature"]),
+    ]
+
+    return DistrictFlowables(letterhead, body, footer)
+
+
+@lru_cache(maxsize=512)
+def regulation_flowable(district_name, violation_type, description):
+    """
+    Shared, pre-parsed paragraph for a regulation's description.
+
+    The description is part of the key so a changed text never reuses a stale
+    paragraph; the violation registry hands out the same interned strings on
+    every letter, so hashing them is free after the first lookup.
+    """
+    # Insert newlines before each bullet point for better formatting
+    formatted_description = description.replace("•", "<br/>•")
+    return WrappedParagraph(formatted_description, get_stylesheet()["RegulationText"])
+
+
+def ensure_output_dir(output_dir):
+    """
+    Create an output directory if it is missing.
+
+    Not cached: long-lived workers call it before every build, so a directory
+    deleted or rotated mid-run is recreated instead of failing every letter.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    return output_dir
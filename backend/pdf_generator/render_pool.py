@@ -0,0 +1,178 @@
+"""
+Process pool for rendering consolidated violation letters in parallel.
+
+Each worker process keeps a single ViolationNoticePDF alive for its whole
+lifetime, so the stylesheet is built once per process instead of once per
+letter. Address groups are handed to the pool in chunks and every rendered
+letter is reported back as a manifest entry (path, error, timing).
+"""
+
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from itertools import islice
+
+from pdf_generator.generate_pdf import ViolationNoticePDF
+
+DEFAULT_OUTPUT_DIR = "pdf_generator/output"
+
+# Address groups per task when the input is a stream of unknown length
+STREAM_CHUNK_SIZE = 8
+
+# Workers are started fresh instead of forked: callers stream groups from an
+# open DB cursor while prefetch threads hold image cache locks, and a forked
+# child could inherit a lock held by one of those threads and hang forever.
+RENDER_START_METHOD = os.environ.get("LETTER_RENDER_START_METHOD") or (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Per-process generator, created by _init_worker when the pool starts
+_worker_generator = None
+
+
+def default_worker_count():
+    """Worker count from LETTER_RENDER_WORKERS, falling back to the CPU count."""
+    configured = os.environ.get("LETTER_RENDER_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    return os.cpu_count() or 1
+
+
+def _init_worker(output_dir):
+    """Pool initializer: build the long-lived generator for this process."""
+    global _worker_generator
+    _worker_generator = ViolationNoticePDF(output_dir=output_dir)
+
+
+def _render_group(generator, violations_list):
+    """Render one address group and return its manifest entry."""
+    first = violations_list[0]
+    entry = {
+        "address": first.get("property_address", "unknown"),
+        "account_number": first.get("account_number"),
+        "violation_count": len(violations_list),
+        "pdf_path": None,
+        "error": None,
+        "seconds": 0.0,
+        "worker_pid": os.getpid(),
+    }
+
+    start = time.perf_counter()
+    try:
+        entry["pdf_path"] = generator.generate_consolidated_pdf(violations_list)
+    except Exception as e:
+        entry["error"] = str(e)
+    entry["seconds"] = round(time.perf_counter() - start, 4)
+
+    return entry
+
+
+def _render_chunk(chunk_index, chunk):
+    """Render a chunk of address groups inside a worker process."""
+    return chunk_index, [_render_group(_worker_generator, group) for group in chunk]
+
+
+def _iter_chunks(groups, chunk_size):
+    """Yield successive lists of at most chunk_size groups."""
+    iterator = iter(groups)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def render_consolidated(
+    consolidated_data_list, output_dir=DEFAULT_OUTPUT_DIR, on_entry=None
+):
+    """
+    Render consolidated letters in this process with one long-lived generator.
+
+    Args:
+        consolidated_data_list: Iterable of violation groups (one list per address)
+        output_dir: Directory to write PDFs into
+        on_entry: Optional callable invoked with each manifest entry as it is rendered
+
+    Returns:
+        list: One manifest entry per address, in input order
+    """
+    generator = ViolationNoticePDF(output_dir=output_dir)
+    manifest = []
+    for group in consolidated_data_list:
+        if not group:
+            continue
+        entry = _render_group(generator, group)
+        manifest.append(entry)
+        if on_entry:
+            on_entry(entry)
+    return manifest
+
+
+def render_consolidated_parallel(
+    consolidated_data_list,
+    workers=None,
+    chunk_size=None,
+    output_dir=DEFAULT_OUTPUT_DIR,
+    on_entry=None,
+):
+    """
+    Render consolidated letters across a pool of worker processes.
+
+    Groups are consumed lazily: chunks are submitted as they are read from the
+    input and at most two chunks per worker are in flight, so a generator such
+    as ViolationDataCollector.iter_violation_groups() streams straight through.
+
+    Args:
+        consolidated_data_list: Iterable of violation groups (one list per address)
+        workers: Number of worker processes (default: LETTER_RENDER_WORKERS or CPU count)
+        chunk_size: Address groups per task (default: about four tasks per worker
+            for sized inputs, STREAM_CHUNK_SIZE for generators)
+        output_dir: Directory the workers write PDFs into
+        on_entry: Optional callable invoked in this process with each manifest
+            entry as its chunk completes (e.g. to report progress)
+
+    Returns:
+        list: One manifest entry per address, in input order
+    """
+    workers = workers or default_worker_count()
+    if chunk_size is None:
+        if hasattr(consolidated_data_list, "__len__"):
+            chunk_size = max(1, math.ceil(len(consolidated_data_list) / (workers * 4)))
+        else:
+            chunk_size = STREAM_CHUNK_SIZE
+    groups = (group for group in consolidated_data_list if group)
+
+    # Create the directory once up front so workers don't race on it
+    os.makedirs(output_dir, exist_ok=True)
+
+    results = {}
+
+    def collect(futures):
+        for future in futures:
+            chunk_index, entries = future.result()
+            results[chunk_index] = entries
+            if on_entry:
+                for entry in entries:
+                    on_entry(entry)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(RENDER_START_METHOD),
+        initializer=_init_worker,
+        initargs=(output_dir,),
+    ) as pool:
+        pending = set()
+        for index, chunk in enumerate(_iter_chunks(groups, chunk_size)):
+            # Bound the work queued ahead of the workers to keep memory flat
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(pool.submit(_render_chunk, index, chunk))
+        collect(as_completed(pending))
+
+    manifest = []
+    for chunk_index in sorted(results):
+        manifest.extend(results[chunk_index])
+    return manifest
@@ -0,0 +1,63 @@
+"""
+Precomputed district account payloads for the autocomplete endpoint.
+
+The full account listing of a district only changes when a roster is
+imported, so it is serialized once, gzip-compressed once and served with a
+content-hash ETag per encoding (the gzip ETag carries a "-gz" suffix, so the
+two byte-different representations never share a strong validator). Entries
+are tied to the roster version stamp and are dropped as soon as an import
+bumps it, which also lets If-None-Match revalidation be answered without
+touching the database.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+
+from utils.roster_version import current_roster_version
+
+
+class CachedPayload:
+    """A serialized JSON response body with its ETag and gzip encoding"""
+
+    def __init__(self, body, version, district_ids):
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.gzip_etag = f"{self.etag}-gz"
+        self.version = version
+        self.district_ids = district_ids
+
+
+class AccountPayloadCache:
+    """Per-district cache of serialized account payloads"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached payload for key if it matches the current roster version"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.version != current_roster_version():
+            self.invalidate()
+            return None
+        return entry
+
+    def put(self, key, payload, district_ids):
+        """Serialize payload and cache it under key"""
+        body = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode(
+            "utf-8"
+        )
+        entry = CachedPayload(body, current_roster_version(), district_ids)
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(self):
+        """Drop every cached payload"""
+        with self._lock:
+            self._entries.clear()
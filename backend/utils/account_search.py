@@ -0,0 +1,258 @@
+"""
+In-memory prefix search over district accounts for address autocomplete.
+
+Each district gets sorted arrays of normalized search terms built from the
+account's service address and name. Every word position of a field is indexed
+("3027 lake helen blvd", "lake helen blvd", "helen blvd", "blvd"), so a bisect
+answers both "starts with" and "word inside the address" queries without
+scanning the district. Terms are kept in one array per ranking tier (start of
+address, start of name, later address word, later name word) and tiers are
+searched best first, so a short query with a huge prefix range can never crowd
+full-address matches out of the results. Indexes are built lazily on first use
+and kept current incrementally as accounts are committed.
+"""
+
+import heapq
+import re
+import threading
+from bisect import bisect_left, insort
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Field weights used for ranking: address matches rank above name matches
+_SEARCH_FIELDS = (("service_address", 0), ("account_name", 1))
+
+# Ranking tiers, best first: (later word of the field, field weight)
+_TIERS = ((0, 0), (0, 1), (1, 0), (1, 1))
+
+# Sorts after every character normalize_search_text can produce
+_PREFIX_END = "\x7f"
+
+
+def normalize_search_text(text):
+    """Lowercase and strip punctuation so queries and addresses compare equally."""
+    if not text:
+        return ""
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+class DistrictAccountIndex:
+    """Sorted-array search index over the accounts of one district."""
+
+    def __init__(self, payloads=()):
+        self._payloads = {}  # account id -> autocomplete payload
+        self._terms_by_id = {}  # account id -> list of indexed term tuples
+        # One sorted list of (term, field weight, word position, account id) per tier
+        self._tiers = {tier: [] for tier in _TIERS}
+        self._lock = threading.Lock()
+
+        for payload in payloads:
+            self._add(payload)
+        for terms in self._tiers.values():
+            terms.sort()
+
+    def __len__(self):
+        return len(self._payloads)
+
+    @staticmethod
+    def _tier_of(term):
+        _term, field_weight, word_position, _account_id = term
+        return (min(word_position, 1), field_weight)
+
+    @staticmethod
+    def _terms_for(payload):
+        terms = []
+        for field, field_weight in _SEARCH_FIELDS:
+            words = normalize_search_text(payload.get(field)).split()
+            for position in range(len(words)):
+                term = " ".join(words[position:])
+                terms.append((term, field_weight, position, payload["id"]))
+        return terms
+
+    def _add(self, payload):
+        terms = self._terms_for(payload)
+        self._payloads[payload["id"]] = payload
+        self._terms_by_id[payload["id"]] = terms
+        for term in terms:
+            self._tiers[self._tier_of(term)].append(term)
+
+    def _remove(self, account_id):
+        self._payloads.pop(account_id, None)
+        for term in self._terms_by_id.pop(account_id, []):
+            terms = self._tiers[self._tier_of(term)]
+            position = bisect_left(terms, term)
+            if position < len(terms) and terms[position] == term:
+                del terms[position]
+
+    def upsert(self, payload):
+        """Add or replace a single account."""
+        with self._lock:
+            self._remove(payload["id"])
+            self._payloads[payload["id"]] = payload
+            terms = self._terms_for(payload)
+            self._terms_by_id[payload["id"]] = terms
+            for term in terms:
+                insort(self._tiers[self._tier_of(term)], term)
+
+    def remove(self, account_id):
+        """Drop a single account from the index."""
+        with self._lock:
+            self._remove(account_id)
+
+    def search(self, query, limit=20):
+        """
+        Return up to limit ranked (rank, payload) matches for query.
+
+        Matches at the start of the service address rank first, then at the
+        start of the account name, then on a later word of the address or
+        name. Each tier's whole prefix range is ranked, and shorter terms win
+        within a tier so exact house numbers surface early.
+        """
+        normalized = normalize_search_text(query)
+        if not normalized:
+            return []
+
+        results = []
+        found = set()
+        with self._lock:
+            for tier in _TIERS:
+                remaining = limit - len(results)
+                if remaining <= 0:
+                    break  # Later tiers can't outrank what we already have
+
+                terms = self._tiers[tier]
+                start = bisect_left(terms, (normalized,))
+                end = bisect_left(terms, (normalized + _PREFIX_END,), lo=start)
+
+                # Shortest matching term per account within this tier
+                best = {}
+                for term, _field_weight, _word_position, account_id in terms[start:end]:
+                    if account_id in found:
+                        continue
+                    if account_id not in best or len(term) < best[account_id]:
+                        best[account_id] = len(term)
+
+                for account_id, term_length in heapq.nsmallest(
+                    remaining,
+                    best.items(),
+                    key=lambda item: (
+                        item[1],
+                        self._payloads[item[0]].get("service_address") or "",
+                    ),
+                ):
+                    found.add(account_id)
+                    results.append((tier + (term_length,), self._payloads[account_id]))
+        return results
+
+
+class AccountSearchRegistry:
+    """
+    Holds one DistrictAccountIndex per district id.
+
+    Args:
+        loader: Callable(district_id) -> list of account payloads, used to build
+            an index the first time a district is searched
+        formatter: Callable(account) -> payload, used for incremental updates,
+            or None when the account should not be searchable
+        version_source: Optional callable returning the current roster version;
+            all indexes are rebuilt when it changes (e.g. after a bulk import
+            in another process)
+    """
+
+    def __init__(self, loader, formatter, version_source=None):
+        self.loader = loader
+        self.formatter = formatter
+        self.version_source = version_source
+        self._version = version_source() if version_source else None
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def get(self, district_id):
+        """Return the index for a district, building it on first use."""
+        if self.version_source:
+            version = self.version_source()
+            if version != self._version:
+                self.invalidate()
+                self._version = version
+
+        index = self._indexes.get(district_id)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(district_id)
+                if index is None:
+                    index = DistrictAccountIndex(self.loader(district_id))
+                    self._indexes[district_id] = index
+        return index
+
+    def search(self, district_ids, query, limit=20):
+        """Search one or more districts and merge the ranked results."""
+        matches = []
+        for district_id in district_ids:
+            matches.extend(self.get(district_id).search(query, limit))
+        matches.sort(
+            key=lambda match: (match[0], match[1].get("service_address") or "")
+        )
+        return [payload for _rank, payload in matches[:limit]]
+
+    def invalidate(self, district_id=None):
+        """Drop the index for one district (or all) so it is rebuilt on next use."""
+        with self._lock:
+            if district_id is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(district_id, None)
+
+    def apply_change(self, district_id, account_id, payload):
+        """Apply a committed account change to the district's index, if built."""
+        # The account may have moved districts, so drop it from every other index
+        for other_id, other_index in list(self._indexes.items()):
+            if other_id != district_id:
+                other_index.remove(account_id)
+
+        index = self._indexes.get(district_id)
+        if index is None:
+            return  # Not built yet; it will load the current rows when first used
+
+        if payload is None:
+            index.remove(account_id)
+        else:
+            index.upsert(payload)
+
+    def listen(self, account_model):
+        """
+        Keep built indexes current as accounts change through the ORM.
+
+        Changes are queued per session at flush time and only applied once the
+        transaction commits, so rolled back changes never reach the index.
+        Bulk inserts bypass ORM events and must call invalidate() instead.
+        """
+        pending_key = "account_search_pending"
+
+        def queue_change(deleted):
+            def handler(mapper, connection, target):
+                session = object_session(target)
+                if session is None:
+                    return
+                # Format now: instances are expired (and SQL is off limits) after commit
+                payload = None if deleted else self.formatter(target)
+                session.info.setdefault(pending_key, []).append(
+                    (target.district_id, target.id, payload)
+                )
+
+            return handler
+
+        event.listen(account_model, "after_insert", queue_change(False))
+        event.listen(account_model, "after_update", queue_change(False))
+        event.listen(account_model, "after_delete", queue_change(True))
+
+        @event.listens_for(Session, "after_commit")
+        def apply_pending(session):
+            for district_id, account_id, payload in session.info.pop(pending_key, []):
+                self.apply_change(district_id, account_id, payload)
+
+        @event.listens_for(Session, "after_rollback")
+        def discard_pending(session):
+            session.info.pop(pending_key, None)
@@ -0,0 +1,79 @@
+"""
+Address normalization shared by roster imports, report intake and letter runs.
+
+Addresses are lowercased, stripped of punctuation and whitespace-collapsed,
+and street suffixes after the house number are mapped to one canonical
+abbreviation, so "3027 Lake Helen Boulevard" and "3027 lake helen blvd."
+compare equal.
+"""
+
+from functools import lru_cache
+
+
+class AddressNormalizer:
+    """Handles address normalization and matching logic."""
+
+    # Street suffix word -> canonical abbreviation, applied per token
+    SUFFIX_MAP = {
+        "street": "st",
+        "avenue": "ave",
+        "boulevard": "blvd",
+        "drive": "dr",
+        "road": "rd",
+        "lane": "ln",
+        "court": "ct",
+        "place": "pl",
+        "trail": "trl",
+        "tr": "trl",
+        "parkway": "pkwy",
+        "circle": "cir",
+        "terrace": "ter",
+        "way": "wy",  # sometimes way or sometimes wy
+    }
+
+    # Characters dropped before tokenizing
+    PUNCTUATION = str.maketrans("", "", ".,")
+
+    @classmethod
+    def normalize(cls, addr):
+        """Normalize address for consistent matching."""
+        if not addr or not isinstance(addr, str):
+            return ""
+        return _normalize_cached(addr)
+
+    @classmethod
+    def normalize_many(cls, addresses):
+        """
+        Normalize a whole column of addresses at once.
+
+        Each distinct address is normalized once. A pandas Series comes back as
+        a Series with the same index; any other iterable comes back as a list.
+        """
+        if hasattr(addresses, "map") and hasattr(addresses, "unique"):
+            lookup = {addr: cls.normalize(addr) for addr in addresses.unique()}
+            return addresses.map(lookup)
+
+        addresses = list(addresses)
+        lookup = {addr: cls.normalize(addr) for addr in set(addresses)}
+        return [lookup[addr] for addr in addresses]
+
+    @classmethod
+    def _normalize_uncached(cls, addr):
+        # Lowercase, drop punctuation and collapse whitespace in one split
+        tokens = addr.lower().translate(cls.PUNCTUATION).split()
+        if not tokens:
+            return ""
+
+        # The first token (usually the house number) is never a suffix
+        suffixes = cls.SUFFIX_MAP
+        for position in range(1, len(tokens)):
+            short_form = suffixes.get(tokens[position])
+            if short_form is not None:
+                tokens[position] = short_form
+        return " ".join(tokens)
+
+
+@lru_cache(maxsize=65536)
+def _normalize_cached(addr):
+    """Memoized AddressNormalizer core; rosters and reports repeat addresses."""
+    return AddressNormalizer._normalize_uncached(addr)
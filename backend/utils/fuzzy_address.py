@@ -0,0 +1,143 @@
+"""
+Fuzzy fallback for violation report addresses that have no exact account match.
+
+Candidates are blocked by house number: a report is only ever compared with
+accounts that share its house number, first those that also share the street
+name token, then the rest of the house number block. A mistyped house number
+is therefore never "corrected" to a neighbour's house; those reports stay
+unmatched for review. Within a block, addresses are scored with difflib's
+similarity ratio on the part after the house number. Unit numbers get the same
+protection: a candidate whose unit number differs is penalized below the
+threshold, so "# 08" is never silently taken to mean "# 208".
+"""
+
+import os
+from difflib import SequenceMatcher
+from typing import Any, NamedTuple
+
+DEFAULT_THRESHOLD = 0.85
+
+# Confidence multiplier for candidates whose unit/other numbers differ
+NUMBER_MISMATCH_PENALTY = 0.8
+
+# Directional words skipped when picking the street name token
+DIRECTIONALS = {
+    "n",
+    "s",
+    "e",
+    "w",
+    "ne",
+    "nw",
+    "se",
+    "sw",
+    "north",
+    "south",
+    "east",
+    "west",
+}
+
+
+class FuzzyMatch(NamedTuple):
+    """Best candidate for an address and its similarity (0.0 - 1.0)."""
+
+    item: Any
+    address: str
+    confidence: float
+
+
+def default_threshold():
+    """Match threshold from FUZZY_MATCH_THRESHOLD, falling back to DEFAULT_THRESHOLD."""
+    return float(os.environ.get("FUZZY_MATCH_THRESHOLD", DEFAULT_THRESHOLD))
+
+
+def _numbers(remainder):
+    """Tokens containing digits (unit numbers, numbered streets) after the house number."""
+    return tuple(
+        token for token in remainder.split() if any(char.isdigit() for char in token)
+    )
+
+
+def split_address(normalized_address):
+    """
+    Split a normalized address into (house number, street token, remainder).
+
+    Returns (None, None, address) when the address does not start with a
+    house number.
+    """
+    tokens = normalized_address.split()
+    if not tokens or not any(char.isdigit() for char in tokens[0]):
+        return None, None, normalized_address
+
+    rest = tokens[1:]
+    street_token = next((token for token in rest if token not in DIRECTIONALS), None)
+    return tokens[0], street_token, " ".join(rest)
+
+
+class FuzzyAddressMatcher:
+    """
+    Blocking index over normalized addresses for fuzzy lookups.
+
+    Args:
+        entries: Iterable of (normalized address, item) pairs, e.g. accounts
+        threshold: Minimum confidence for match() to accept a candidate
+    """
+
+    def __init__(self, entries, threshold=None):
+        self.threshold = default_threshold() if threshold is None else threshold
+        # house number -> [(remainder, numbers in remainder, address, item)]
+        self._by_house = {}
+        self._by_street = {}  # (house number, street token) -> same entries
+
+        for address, item in entries:
+            if not address:
+                continue
+            house, street_token, remainder = split_address(address)
+            if house is None:
+                continue
+            entry = (remainder, _numbers(remainder), address, item)
+            self._by_house.setdefault(house, []).append(entry)
+            self._by_street.setdefault((house, street_token), []).append(entry)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._by_house.values())
+
+    @staticmethod
+    def _best_of(remainder, entries, best):
+        numbers = _numbers(remainder)
+        scorer = SequenceMatcher(autojunk=False)
+        scorer.set_seq2(remainder)  # difflib caches details about seq2
+        for candidate_remainder, candidate_numbers, address, item in entries:
+            penalty = 1.0 if candidate_numbers == numbers else NUMBER_MISMATCH_PENALTY
+            scorer.set_seq1(candidate_remainder)
+            # quick_ratio is a cheap upper bound; skip candidates that cannot win
+            if best and scorer.quick_ratio() * penalty <= best.confidence:
+                continue
+            confidence = scorer.ratio() * penalty
+            if best is None or confidence > best.confidence:
+                best = FuzzyMatch(item, address, confidence)
+        return best
+
+    def best(self, normalized_address):
+        """Return the best FuzzyMatch regardless of threshold, or None."""
+        if not normalized_address:
+            return None
+        house, street_token, remainder = split_address(normalized_address)
+        if house is None:
+            return None
+
+        # Same house number and street name first: usually a one-entry block
+        best = self._best_of(
+            remainder, self._by_street.get((house, street_token), []), None
+        )
+        if best and best.confidence >= self.threshold:
+            return best
+
+        # Misspelled street name: widen to every address with this house number
+        return self._best_of(remainder, self._by_house.get(house, []), best)
+
+    def match(self, normalized_address):
+        """Return the best FuzzyMatch at or above the threshold, or None."""
+        candidate = self.best(normalized_address)
+        if candidate and candidate.confidence >= self.threshold:
+            return candidate
+        return None
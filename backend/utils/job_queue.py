@@ -0,0 +1,164 @@
+"""
+Local job queue for letter runs and board reports.
+
+Jobs live in a small SQLite database of their own (JOB_QUEUE_PATH) rather than
+in the application database, so nothing external is needed and progress
+updates from a worker never contend with the long-running report queries of
+the job itself. The web process enqueues jobs and reads their status; one or
+more `python worker.py` processes claim and run them.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+
+DEFAULT_JOB_QUEUE_PATH = "instance/jobs.db"
+
+JOB_KINDS = ("letters", "board_report")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    params TEXT NOT NULL DEFAULT '{}',
+    progress INTEGER NOT NULL DEFAULT 0,
+    total INTEGER,
+    result TEXT,
+    error TEXT,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status_id ON jobs (status, id);
+"""
+
+
+def _isoformat(timestamp):
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+class JobQueue:
+    """SQLite-backed FIFO queue of jobs (queued -> running -> succeeded/failed)."""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("JOB_QUEUE_PATH", DEFAULT_JOB_QUEUE_PATH)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as connection:
+            # WAL lets the web process read status while a worker writes progress
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    def _connect(self):
+        # A connection per operation keeps the queue safe across threads and processes
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _execute(self, sql, params=()):
+        with closing(self._connect()) as connection:
+            return connection.execute(sql, params).rowcount
+
+    @staticmethod
+    def _to_dict(row):
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+
+        end = job["finished_at"] or time.time()
+        elapsed = end - job["started_at"] if job["started_at"] else 0.0
+        job["elapsed_seconds"] = round(elapsed, 3)
+        job["throughput"] = round(job["progress"] / elapsed, 3) if elapsed > 0 else 0.0
+        for field in ("created_at", "started_at", "heartbeat_at", "finished_at"):
+            job[field] = _isoformat(job[field])
+        return job
+
+    def enqueue(self, kind, params=None):
+        """Add a job and return it as a dictionary."""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        with closing(self._connect()) as connection:
+            cursor = connection.execute(
+                "INSERT INTO jobs (kind, params, created_at) VALUES (?, ?, ?)",
+                (kind, json.dumps(params or {}), time.time()),
+            )
+            job_id = cursor.lastrowid
+        return self.get(job_id)
+
+    def get(self, job_id):
+        """Return a job as a dictionary, or None if it does not exist."""
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._to_dict(row) if row else None
+
+    def claim(self, worker):
+        """Atomically move the oldest queued job to running and return it (or None)."""
+        now = time.time()
+        with closing(self._connect()) as connection:
+            # IMMEDIATE takes the write lock up front so two workers never claim one job
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+            connection.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, started_at = ?, "
+                "heartbeat_at = ? WHERE id = ?",
+                (worker, now, now, row["id"]),
+            )
+            connection.execute("COMMIT")
+        return self.get(row["id"])
+
+    def update_progress(self, job_id, progress, total=None):
+        """Record items done (and the total, once known) and refresh the heartbeat."""
+        self._execute(
+            "UPDATE jobs SET progress = ?, total = COALESCE(?, total), heartbeat_at = ? "
+            "WHERE id = ?",
+            (progress, total, time.time(), job_id),
+        )
+
+    def complete(self, job_id, result):
+        """Mark a job as succeeded with its result payload."""
+        now = time.time()
+        self._execute(
+            "UPDATE jobs SET status = 'succeeded', result = ?, heartbeat_at = ?, "
+            "finished_at = ? WHERE id = ?",
+            (json.dumps(result, default=str), now, now, job_id),
+        )
+
+    def fail(self, job_id, error, result=None):
+        """Mark a job as failed."""
+        now = time.time()
+        self._execute(
+            "UPDATE jobs SET status = 'failed', error = ?, result = ?, heartbeat_at = ?, "
+            "finished_at = ? WHERE id = ?",
+            (
+                str(error),
+                json.dumps(result, default=str) if result else None,
+                now,
+                now,
+                job_id,
+            ),
+        )
+
+    def fail_stale(self, stale_seconds):
+        """Fail running jobs whose worker stopped sending heartbeats; returns the count."""
+        now = time.time()
+        return self._execute(
+            "UPDATE jobs SET status = 'failed', error = 'Worker stopped responding', "
+            "finished_at = ? WHERE status = 'running' AND heartbeat_at < ?",
+            (now, now - stale_seconds),
+        )
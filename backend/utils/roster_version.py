@@ -0,0 +1,33 @@
+"""
+Cross-process version stamp for imported account rosters.
+
+Roster imports usually run in a different process (manage_db.py, a worker)
+than the web workers that cache account data. Each import replaces a small
+stamp file; caches compare its identity with the one they were built against
+and rebuild when it changed. Checking the stamp is a single os.stat call, so
+it never touches the database.
+"""
+
+import os
+import uuid
+
+ROSTER_VERSION_PATH = os.environ.get("ROSTER_VERSION_PATH", "instance/roster_version")
+
+
+def current_roster_version():
+    """Return an opaque token identifying the current roster version."""
+    try:
+        stat = os.stat(ROSTER_VERSION_PATH)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def bump_roster_version():
+    """Mark all cached account data as stale after a roster import."""
+    os.makedirs(os.path.dirname(ROSTER_VERSION_PATH) or ".", exist_ok=True)
+    tmp_path = f"{ROSTER_VERSION_PATH}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(uuid.uuid4().hex)
+    # Replacing the file gives it a new inode, so the version always changes
+    os.replace(tmp_path, ROSTER_VERSION_PATH)
@@ -0,0 +1,245 @@
+"""
+Storage backends for violation images.
+
+Every image goes through one backend per process, selected with
+STORAGE_BACKEND: "cloudinary" (default) or "local". A stored image is
+identified by its key, which is what ViolationImage.filename holds: the
+Cloudinary public_id, or a relative path under the local root. Both backends
+expose the same put/get/stream/url operations, so the upload endpoint, the
+image route and the PDF generators (through image_transport.StorageTransport)
+don't care where the bytes live, and local deployments and offline runs never
+touch the network.
+
+Local keys look like "violations/<32 hex chars>.<ext>" and are stored in a
+sharded layout (violations/ab/cd/abcd....jpg) so no directory grows past a few
+hundred entries. Keys without a folder are legacy flat files in the root.
+"""
+
+import io
+import mimetypes
+import os
+import re
+import shutil
+import tempfile
+import threading
+import uuid
+from typing import NamedTuple, Optional
+from urllib.parse import quote, unquote, urlparse
+
+DEFAULT_LOCAL_ROOT = "uploads/violation_images"
+DEFAULT_BASE_URL = "/api/images"
+
+_SAFE_KEY = re.compile(r"^[A-Za-z0-9_\-][A-Za-z0-9_\-./]*$")
+
+# MIME type stored when an upload's type can't be determined
+DEFAULT_MIME_TYPE = "application/octet-stream"
+
+
+def guess_mime_type(*names):
+    """MIME type for the first name with a known extension, else the default."""
+    for name in names:
+        mime_type = mimetypes.guess_type(name or "")[0]
+        if mime_type:
+            return mime_type
+    return DEFAULT_MIME_TYPE
+
+
+class StoredFile(NamedTuple):
+    """Result of storing an upload."""
+
+    key: str
+    url: str
+    size: int
+    mime_type: str
+
+
+class StorageBackend:
+    """Interface shared by the storage backends."""
+
+    name = None
+    base_url = None
+
+    def put(self, fileobj, filename, folder="violations") -> StoredFile:
+        """Store a file-like object and return where it went."""
+        raise NotImplementedError
+
+    def get(self, key) -> bytes:
+        """Return the bytes stored under key."""
+        raise NotImplementedError
+
+    def stream(self, key):
+        """Return a readable binary file object for key (caller closes it)."""
+        raise NotImplementedError
+
+    def url(self, key) -> str:
+        """Return the URL clients should use to fetch key."""
+        raise NotImplementedError
+
+    def local_path(self, key) -> Optional[str]:
+        """Return the file path for key if it is on local disk, else None."""
+        return None
+
+    def key_for_url(self, url) -> Optional[str]:
+        """Return the key a URL from url() refers to, or None if it isn't ours."""
+        prefix = urlparse(self.base_url).path.rstrip("/") + "/"
+        path = urlparse(url).path
+        if not path.startswith(prefix):
+            return None
+        return unquote(path[len(prefix) :])
+
+
+class LocalStorage(StorageBackend):
+    """Images on the local filesystem, served by the API's /api/images route."""
+
+    name = "local"
+
+    def __init__(self, root=DEFAULT_LOCAL_ROOT, base_url=DEFAULT_BASE_URL):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path_for(self, key):
+        if not _SAFE_KEY.match(key) or ".." in key.split("/"):
+            raise ValueError(f"Invalid storage key: {key}")
+        folder, _, name = key.rpartition("/")
+        if not folder:
+            return os.path.join(self.root, name)
+        return os.path.join(self.root, folder, name[:2], name[2:4], name)
+
+    def put(self, fileobj, filename, folder="violations"):
+        ext = os.path.splitext(filename or "")[1].lower()
+        key = f"{folder}/{uuid.uuid4().hex}{ext}"
+        path = self._path_for(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to a temp file and rename so readers never see a partial image
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(fileobj, f)
+                size = f.tell()
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return StoredFile(key, self.url(key), size, guess_mime_type(filename))
+
+    def get(self, key):
+        with open(self._path_for(key), "rb") as f:
+            return f.read()
+
+    def stream(self, key):
+        return open(self._path_for(key), "rb")
+
+    def url(self, key):
+        return f"{self.base_url}/{quote(key)}"
+
+    def local_path(self, key):
+        path = self._path_for(key)
+        return path if os.path.isfile(path) else None
+
+
+class CloudinaryStorage(StorageBackend):
+    """Images on Cloudinary; keys are public_ids."""
+
+    name = "cloudinary"
+    base_url = DEFAULT_BASE_URL
+
+    def __init__(self, cloud_name=None, api_key=None, api_secret=None):
+        # Imported here so processes using local storage never load the SDK
+        import cloudinary
+
+        cloudinary.config(
+            cloud_name=cloud_name or os.getenv("CLOUD_NAME"),
+            api_key=api_key or os.getenv("API_KEY"),
+            api_secret=api_secret or os.getenv("API_SECRET"),
+            secure=True,
+        )
+        self._session = None
+
+    def put(self, fileobj, filename, folder="violations"):
+        import cloudinary.uploader
+
+        result = cloudinary.uploader.upload(
+            fileobj, folder=folder, use_filename=True, unique_filename=True
+        )
+        # Cloudinary reports the stored format ("jpg"), not a MIME type
+        return StoredFile(
+            result["public_id"],
+            result["secure_url"],
+            result.get("bytes", 0),
+            guess_mime_type(f"upload.{result.get('format')}", filename),
+        )
+
+    def get(self, key):
+        import requests
+
+        if self._session is None:
+            self._session = requests.Session()
+        response = self._session.get(self.url(key), timeout=(5, 30))
+        response.raise_for_status()
+        return response.content
+
+    def stream(self, key):
+        return io.BytesIO(self.get(key))
+
+    def url(self, key):
+        from cloudinary.utils import cloudinary_url
+
+        return cloudinary_url(key, secure=True)[0]
+
+    def key_for_url(self, url):
+        # Delivery URLs look like .../image/upload/v<version>/<public_id>.<ext>
+        match = re.search(r"/image/upload/(?:v\d+/)?(.+?)(?:\.\w+)?$", url)
+        if match:
+            return unquote(match.group(1))
+        return super().key_for_url(url)
+
+
+STORAGE_BACKENDS = {
+    "cloudinary": CloudinaryStorage,
+    "local": LocalStorage,
+}
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def storage_backend_name():
+    """Configured backend name from STORAGE_BACKEND (default: cloudinary)."""
+    return os.environ.get("STORAGE_BACKEND", "cloudinary").lower()
+
+
+def _storage_from_env():
+    name = storage_backend_name()
+    if name == "local":
+        return LocalStorage(
+            root=os.environ.get(
+                "LOCAL_STORAGE_ROOT",
+                os.environ.get("UPLOAD_FOLDER", DEFAULT_LOCAL_ROOT),
+            ),
+            base_url=os.environ.get("LOCAL_STORAGE_BASE_URL", DEFAULT_BASE_URL),
+        )
+    if name not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown STORAGE_BACKEND: {name}")
+    return STORAGE_BACKENDS[name]()
+
+
+def get_storage():
+    """Return the process-wide storage backend, creating it on first use."""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = _storage_from_env()
+    return _storage
+
+
+def set_storage(storage):
+    """Replace the process-wide storage backend (e.g. a LocalStorage in tests)."""
+    global _storage
+    with _storage_lock:
+        _storage = storage
@@ -0,0 +1,234 @@
+"""
+Compiled registry of district violation codes.
+
+utils/violation_codes.py stays the human-edited source, but it is read as data
+(parsed with ast, never executed) so duplicate keys can be caught: a dict
+literal silently keeps the last of two identical keys. Duplicates with
+different values and entries with missing fields fail the build with a
+ViolationRegistryError; identical duplicates are reported as warnings.
+
+The compiled registry is written to a JSON artifact next to the source
+(`python manage_db.py compile-violations`) together with a hash of the
+source, so startup loads the JSON in a few milliseconds and falls back to
+compiling the source when the artifact is missing or stale.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_PATH = os.path.join(UTILS_DIR, "violation_codes.py")
+DEFAULT_ARTIFACT_PATH = os.path.join(UTILS_DIR, "violation_codes.json")
+
+FIELDS = ("title", "code_number", "violation_name", "description")
+# Fields every letter needs; the others may be blank in the source
+REQUIRED_FIELDS = ("title", "description")
+
+
+class ViolationRegistryError(ValueError):
+    """The violation code source has conflicting or incomplete entries."""
+
+    def __init__(self, problems):
+        super().__init__(
+            "Invalid violation codes:\n" + "\n".join(f"  - {p}" for p in problems)
+        )
+        self.problems = problems
+
+
+class ViolationCode(NamedTuple):
+    """One district's regulation for a violation type."""
+
+    district: str
+    violation_type: str
+    title: str
+    code_number: str
+    violation_name: str
+    description: str
+
+
+class ViolationRegistry:
+    """Violation codes keyed by (district, violation type)."""
+
+    def __init__(self, codes, source_sha1=None, warnings=None):
+        self._codes = {(code.district, code.violation_type): code for code in codes}
+        self.source_sha1 = source_sha1
+        self.warnings = warnings or []
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __iter__(self):
+        return iter(self._codes.values())
+
+    def get(self, district, violation_type) -> Optional[ViolationCode]:
+        """Return the code for a district and violation type, or None."""
+        return self._codes.get((district, violation_type))
+
+    def districts(self):
+        return sorted({district for district, _ in self._codes})
+
+    def violation_types(self, district):
+        return [code.violation_type for code in self if code.district == district]
+
+    def to_json(self):
+        return {
+            "source_sha1": self.source_sha1,
+            "codes": [code._asdict() for code in self],
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        codes = [ViolationCode(**_interned(code)) for code in data["codes"]]
+        return cls(codes, source_sha1=data.get("source_sha1"))
+
+
+def _interned(values):
+    """Intern the strings of a code so repeated texts share one object."""
+    return {
+        key: sys.intern(value) if isinstance(value, str) else value
+        for key, value in values.items()
+    }
+
+
+def _source_sha1(source):
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+def _literal_items(node, where, problems):
+    """
+    Return the {key: value node} items of a dict literal and its duplicate
+    keys as (key, first node, second node). Later definitions win, as they do
+    when the source is executed.
+    """
+    if not isinstance(node, ast.Dict):
+        problems.append(f"{where}: expected a dict literal")
+        return {}, []
+
+    items = {}
+    duplicates = []
+    for key_node, value_node in zip(node.keys, node.values):
+        key = ast.literal_eval(key_node) if key_node is not None else None
+        if not isinstance(key, str):
+            problems.append(f"{where}: non-string key on line {value_node.lineno}")
+            continue
+        if key in items:
+            duplicates.append((key, items[key], value_node))
+        items[key] = value_node
+    return items, duplicates
+
+
+def compile_registry(source_path=SOURCE_PATH):
+    """
+    Build a ViolationRegistry from the violation_codes.py source.
+
+    Raises ViolationRegistryError if a district or violation type is defined
+    twice with different contents, or an entry is missing a field.
+    """
+    with open(source_path, encoding="utf-8") as f:
+        source = f.read()
+    tree = ast.parse(source, filename=source_path)
+
+    violations_node = next(
+        (
+            node.value
+            for node in tree.body
+            if isinstance(node, ast.Assign)
+            and any(
+                isinstance(target, ast.Name) and target.id == "violations"
+                for target in node.targets
+            )
+        ),
+        None,
+    )
+    if violations_node is None:
+        raise ViolationRegistryError([f"{source_path}: no `violations = {{...}}`"])
+
+    problems = []
+    warnings = []
+
+    def check_duplicates(duplicates, where):
+        for key, first, second in duplicates:
+            message = (
+                f"{where}{key!r} is defined on lines {first.lineno} and "
+                f"{second.lineno}"
+            )
+            if ast.dump(first) == ast.dump(second):
+                warnings.append(f"{message} (identical)")
+            else:
+                problems.append(f"{message} with different values")
+
+    districts, duplicates = _literal_items(violations_node, "violations", problems)
+    check_duplicates(duplicates, "district ")
+
+    codes = []
+    for district, district_node in districts.items():
+        types, duplicates = _literal_items(district_node, district, problems)
+        check_duplicates(duplicates, f"{district}: violation type ")
+
+        for violation_type, code_node in types.items():
+            try:
+                entry = ast.literal_eval(code_node)
+            except ValueError:
+                problems.append(f"{district}.{violation_type}: not a literal")
+                continue
+            missing = [field for field in REQUIRED_FIELDS if not entry.get(field)]
+            if missing:
+                problems.append(
+                    f"{district}.{violation_type}: missing {', '.join(missing)}"
+                )
+                continue
+            codes.append(
+                ViolationCode(
+                    **_interned(
+                        {
+                            "district": district,
+                            "violation_type": violation_type,
+                            **{field: str(entry.get(field) or "") for field in FIELDS},
+                        }
+                    )
+                )
+            )
+
+    if problems:
+        raise ViolationRegistryError(problems)
+    return ViolationRegistry(codes, source_sha1=_source_sha1(source), warnings=warnings)
+
+
+def write_artifact(registry, artifact_path=DEFAULT_ARTIFACT_PATH):
+    """Write the compiled registry to its JSON artifact."""
+    tmp_path = f"{artifact_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(registry.to_json(), f, indent=1, ensure_ascii=False)
+    os.replace(tmp_path, artifact_path)
+    return artifact_path
+
+
+def load_registry(artifact_path=None, source_path=SOURCE_PATH):
+    """
+    Load the compiled artifact, or compile the source if the artifact is
+    missing or was built from a different version of the source.
+    """
+    artifact_path = artifact_path or os.environ.get(
+        "VIOLATION_REGISTRY_PATH", DEFAULT_ARTIFACT_PATH
+    )
+    try:
+        with open(artifact_path, encoding="utf-8") as f:
+            data = json.load(f)
+        with open(source_path, encoding="utf-8") as f:
+            current_sha1 = _source_sha1(f.read())
+        if data.get("source_sha1") == current_sha1:
+            return ViolationRegistry.from_json(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return compile_registry(source_path)
+
+
+@lru_cache(maxsize=None)
+def get_registry():
+    """Process-wide violation registry."""
+    return load_registry()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Background worker for letter runs and board reports.
+
+Claims jobs queued through the API (POST /api/districts/<code>/letters or
+/board-report) from the local job queue and runs the collect -> prefetch ->
+render pipeline, reporting progress and throughput back to the queue.
+
+Usage:
+  python worker.py          # poll for jobs until stopped
+  python worker.py --once   # run every queued job, then exit
+"""
+
+import os
+import socket
+import sys
+import time
+import traceback
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add the current directory to Python path so we can import our app
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from letter_generation import InspectionWindow, ViolationDataCollector, record_mailing
+from pdf_generator.board_report import generate_board_report
+from pdf_generator.generate_pdf import ViolationNoticePDF
+from pdf_generator.image_prefetch import prefetch_images, prefetch_stream
+from pdf_generator.render_pool import (
+    default_worker_count,
+    render_consolidated,
+    render_consolidated_parallel,
+)
+from utils.job_queue import JobQueue
+
+JOB_OUTPUT_DIR = os.environ.get("JOB_OUTPUT_DIR", "pdf_generator/output/jobs")
+POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", 2))
+# Running jobs without a heartbeat for this long are failed on worker startup
+STALE_JOB_SECONDS = float(os.environ.get("JOB_STALE_SECONDS", 1800))
+# Minimum seconds between progress writes
+PROGRESS_INTERVAL = 1.0
+
+
+class ProgressReporter:
+    """Throttled progress updates for one job."""
+
+    def __init__(self, queue, job_id):
+        self.queue = queue
+        self.job_id = job_id
+        self.done = 0
+        self._last_write = 0.0
+
+    def advance(self, count=1):
+        self.done += count
+        now = time.monotonic()
+        if now - self._last_write >= PROGRESS_INTERVAL:
+            self.queue.update_progress(self.job_id, self.done)
+            self._last_write = now
+
+
+def job_output_dir(job):
+    path = os.path.join(JOB_OUTPUT_DIR, str(job["id"]))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def run_letters_job(queue, job):
+    """Stream violation groups into the letter renderer."""
+    params = job["params"]
+    district_name = params["district_name"]
+    output_dir = job_output_dir(job)
+
+    collector = ViolationDataCollector(
+        district_name, window=InspectionWindow.from_params(params, district_name)
+    )
+    groups = prefetch_stream(collector.iter_violation_groups())
+
+    if params.get("merged"):
+        return run_merged_letters(queue, job, collector, groups, output_dir)
+
+    progress = ProgressReporter(queue, job["id"])
+
+    def on_entry(entry):
+        progress.advance()
+
+    workers = int(params.get("workers") or default_worker_count())
+    if workers > 1:
+        manifest = render_consolidated_parallel(
+            groups, workers=workers, output_dir=output_dir, on_entry=on_entry
+        )
+    else:
+        manifest = render_consolidated(groups, output_dir=output_dir, on_entry=on_entry)
+    queue.update_progress(job["id"], progress.done, total=len(manifest))
+
+    if params.get("record_mailing"):
+        record_mailing(district_name)
+
+    return {
+        "output_dir": output_dir,
+        "letters": sum(1 for entry in manifest if entry["pdf_path"]),
+        "failed": [
+            {"address": entry["address"], "error": entry["error"]}
+            for entry in manifest
+            if entry["error"]
+        ],
+        "pdf_paths": [entry["pdf_path"] for entry in manifest if entry["pdf_path"]],
+        "review_queue": collector.review_queue,
+    }
+
+
+def run_merged_letters(queue, job, collector, groups, output_dir):
+    """Render the run into merged mail-merge PDFs (letters_per_file per file)."""
+    params = job["params"]
+    letters_per_file = int(params.get("letters_per_file") or 0) or None
+    progress = ProgressReporter(queue, job["id"])
+
+    def counted(groups):
+        for group in groups:
+            yield group
+            progress.advance()
+
+    files = ViolationNoticePDF(output_dir=output_dir).generate_merged_pdf(
+        counted(groups),
+        letters_per_file=letters_per_file,
+        basename=f"{params.get('district_code') or 'letters'}_mail_merge",
+    )
+    queue.update_progress(job["id"], progress.done, total=progress.done)
+
+    if params.get("record_mailing"):
+        record_mailing(params["district_name"])
+
+    return {
+        "output_dir": output_dir,
+        "letters": sum(merged["letters"] for merged in files),
+        "failed": [error for merged in files for error in merged["errors"]],
+        "pdf_paths": [merged["pdf_path"] for merged in files if merged["pdf_path"]],
+        "index_paths": [
+            merged["index_path"] for merged in files if merged["index_path"]
+        ],
+        "review_queue": collector.review_queue,
+    }
+
+
+def run_board_report_job(queue, job):
+    """Collect the inspection window and build the board report PDF."""
+    params = job["params"]
+    district_name = params["district_name"]
+    output_path = os.path.join(job_output_dir(job), "board_report.pdf")
+
+    collector = ViolationDataCollector(
+        district_name, window=InspectionWindow.from_params(params, district_name)
+    )
+    consolidated_data = collector.collect_violation_data()
+    violations = [violation for group in consolidated_data for violation in group]
+    queue.update_progress(job["id"], 0, total=len(violations))
+
+    prefetch_images(consolidated_data)
+    generate_board_report(
+        output_path=output_path,
+        district_name=params.get("district_label") or district_name,
+        violations=violations,
+        date=datetime.now().strftime("%B %d, %Y"),
+    )
+    queue.update_progress(job["id"], len(violations))
+
+    return {"output_path": output_path, "violations": len(violations)}
+
+
+JOB_RUNNERS = {
+    "letters": run_letters_job,
+    "board_report": run_board_report_job,
+}
+
+
+def process_job(queue, job):
+    """Run one claimed job and record its outcome."""
+    print(f"▶️  Job {job['id']} ({job['kind']}) started: {job['params']}")
+    start = time.perf_counter()
+    try:
+        result = JOB_RUNNERS[job["kind"]](queue, job)
+    except Exception as e:
+        traceback.print_exc()
+        queue.fail(job["id"], e)
+        print(f"❌ Job {job['id']} failed: {e}")
+        return
+
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    queue.complete(job["id"], result)
+    print(f"✅ Job {job['id']} finished in {result['seconds']}s")
+
+
+def main():
+    once = "--once" in sys.argv[1:]
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    queue = JobQueue()
+    app = create_app()
+
+    stale = queue.fail_stale(STALE_JOB_SECONDS)
+    if stale:
+        print(f"Marked {stale} stale job(s) as failed")
+    print(f"Worker {worker_id} polling {queue.path}")
+
+    while True:
+        job = queue.claim(worker_id)
+        if job is None:
+            if once:
+                return
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        with app.app_context():
+            process_job(queue, job)
+
+
+if __name__ == "__main__":
+    main()